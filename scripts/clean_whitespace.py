@@ -1,23 +1,66 @@
 #!/usr/bin/env python3
+import json
 import os
 import re
 import sys
 
 # Configuration
-TARGET_EXTENSIONS = {
+TARGET_EXTENSIONS = frozenset({
     '.py', '.md', '.mdc', '.txt', '.json', '.html',
     '.js', '.ts', '.css', '.scss', '.yaml', '.yml',
     '.sh', '.bash', '.zsh', '.env', '.example'
-}
-IGNORE_DIRS = {
+})
+SPECIAL_FILES = frozenset({'requirements.txt', '.gitignore', '.editorconfig', 'Dockerfile'})
+IGNORE_DIRS = frozenset({
     '.git', '.venv', '__pycache__', 'node_modules',
     'chroma_db', 'data', 'dist', 'build',
-    '.pytest_cache', '.mypy_cache', 'logs'
-}
+    '.pytest_cache', '.mypy_cache', 'logs', '.cache'
+})
+# [st_mtime_ns, st_size] of every file checked on the previous run, keyed by
+# path relative to the root. Files whose stamp is unchanged are skipped
+# without being opened; any difference (including an older mtime from a
+# checkout, stash pop or timestamp-preserving copy) rechecks the file.
+CACHE_PATH = os.path.join('.cache', 'clean_whitespace.json')
 
-def is_text_file(filepath):
-    """Check if file has a target extension."""
-    return os.path.splitext(filepath)[1] in TARGET_EXTENSIONS or os.path.basename(filepath) in ['requirements.txt', '.gitignore', '.editorconfig', 'Dockerfile']
+_MULTI_NL = re.compile(r'\n{3,}')
+_TAIL_BYTES = 4096
+_SCAN_CHUNK = 65536
+
+def is_text_file(filename):
+    """Check if a bare file name has a target extension or is a special file."""
+    dot = filename.rfind('.')
+    ext = filename[dot:] if dot > 0 else ''
+    return ext in TARGET_EXTENSIONS or filename in SPECIAL_FILES
+
+def is_clean_on_disk(f):
+    """Byte-level check that a file opened in ``'rb'`` needs no rewrite.
+
+    Inspects the last 4 KiB for the EOF rule first, then streams the file in
+    64 KiB chunks looking for a 3+ newline run, so clean files are never
+    decoded or held in memory whole. Any ``\\r`` defers to the text path,
+    whose universal-newline read treats it as a line break.
+    """
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(max(0, size - _TAIL_BYTES))
+    tail = f.read()
+    if not tail.endswith(b'\n'):
+        return False
+    # Byte before the final newline must survive str.rstrip(); non-ASCII
+    # bytes may be part of a Unicode space, so those defer to the text path.
+    prev = tail[-2:-1]
+    if prev and (prev >= b'\x80' or chr(prev[0]).isspace()):
+        return False
+
+    f.seek(0)
+    carry = b''
+    for chunk in iter(lambda: f.read(_SCAN_CHUNK), b''):
+        window = carry + chunk
+        if b'\n\n\n' in window or b'\r' in chunk:
+            return False
+        # Keep 2 bytes so a run split across chunks is still seen.
+        carry = window[-2:]
+    return True
 
 def clean_file(filepath):
     """
@@ -26,6 +69,14 @@ def clean_file(filepath):
     2. Ensures exactly one newline at EOF.
     3. Collapses 3+ consecutive newlines to 2.
     """
+    try:
+        with open(filepath, 'rb') as f:
+            if is_clean_on_disk(f):
+                return False
+    except Exception as e:
+        print(f"Error reading {filepath}: {e}")
+        return False
+
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -36,13 +87,21 @@ def clean_file(filepath):
         print(f"Error reading {filepath}: {e}")
         return False
 
+    # Fast path: no 3+ newline runs and the file already ends in exactly one
+    # newline with no trailing whitespace before it — i.e. the rewrite below
+    # would be a no-op. Pure substring checks, no regex or string rebuild.
+    needs_collapse = '\n\n\n' in content
+    if not needs_collapse and content.endswith('\n') and not content[:-1][-1:].isspace():
+        return False
+
     original_content = content
 
     # 1. Normalize line endings (optional, usually handled by git, but good for processing)
     # content = content.replace('\r\n', '\n')
 
     # 2. Collapse 3+ newlines to 2
-    content = re.sub(r'\n{3,}', '\n\n', content)
+    if needs_collapse:
+        content = _MULTI_NL.sub('\n\n', content)
 
     # 3. Ensure exactly one newline at EOF
     content = content.rstrip() + '\n'
@@ -58,21 +117,78 @@ def clean_file(filepath):
         return True
     return False
 
-def main():
-    root_dir = os.getcwd()
+def iter_candidate_files(root_dir):
+    """Yield DirEntry objects for target files under *root_dir*.
+
+    ``os.scandir`` exposes the name and a cached stat per entry, so extension
+    checks need no extra syscalls and IGNORE_DIRS subtrees are never entered.
+    """
+    stack = [root_dir]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError as e:
+            print(f"Error scanning directory: {e}")
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORE_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file() and is_text_file(entry.name):
+                    yield entry
+
+def load_mtime_cache(cache_file):
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_mtime_cache(cache_file, mtimes):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(mtimes, f)
+    except OSError as e:
+        print(f"Error writing cache {cache_file}: {e}")
+
+def file_stamp(st):
+    """Cache stamp for a stat result; equal stamps mean the file is untouched."""
+    return [st.st_mtime_ns, st.st_size]
+
+def clean_tree(root_dir, cache_file):
+    """Clean every candidate file under *root_dir*; return how many changed."""
+    cached_stamps = load_mtime_cache(cache_file)
+    stamps = {}
     changed_files = 0
 
-    # Walk the directory
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        # Filter directories in-place
-        dirnames[:] = [d for d in dirnames if d not in IGNORE_DIRS]
+    for entry in iter_candidate_files(root_dir):
+        rel_path = os.path.relpath(entry.path, root_dir)
+        try:
+            stamp = file_stamp(entry.stat())
+        except OSError:
+            continue
+
+        # Untouched since the last run already left it clean — skip the read.
+        if cached_stamps.get(rel_path) == stamp:
+            stamps[rel_path] = stamp
+            continue
 
-        for filename in filenames:
-            filepath = os.path.join(dirpath, filename)
+        if clean_file(entry.path):
+            changed_files += 1
+        try:
+            stamps[rel_path] = file_stamp(os.stat(entry.path))
+        except OSError:
+            pass
 
-            if is_text_file(filepath):
-                if clean_file(filepath):
-                    changed_files += 1
+    save_mtime_cache(cache_file, stamps)
+    return changed_files
+
+def main():
+    root_dir = os.getcwd()
+    changed_files = clean_tree(root_dir, os.path.join(root_dir, CACHE_PATH))
 
     if changed_files > 0:
         print(f"\nCleaned {changed_files} files.")
@@ -7,6 +7,10 @@ Checks for:
 - Required fields presence
 - Deprecated fields usage
 - Schema compliance
+
+When ``fastjsonschema`` is installed, the schema is compiled once into a
+validator function and reused for every agent; otherwise the structural
+checks fall back to the hand-rolled required-field walk below.
 """
 
 import os
@@ -14,8 +18,19 @@ import re
 import sys
 import json
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    import fastjsonschema
+except ImportError:  # optional — hand-rolled checks are used instead
+    fastjsonschema = None
 
 SKILL_ID_RE = re.compile(r"^skill-[a-z0-9-]+$")
 IMPLANT_ID_RE = re.compile(r"^implant-[a-z0-9-]+$")
@@ -33,6 +48,12 @@ def load_schema() -> dict:
     with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def compile_validator(schema: dict) -> Optional[Callable[[dict], dict]]:
+    """Compile the schema into a reusable validator, or None without fastjsonschema."""
+    if fastjsonschema is None:
+        return None
+    return fastjsonschema.compile(schema)
+
 def extract_frontmatter(file_path: Path) -> Dict | None:
     """Extract YAML frontmatter from an MDC file."""
     try:
@@ -42,20 +63,19 @@ def extract_frontmatter(file_path: Path) -> Dict | None:
         if not content.startswith("---"):
             return None
 
-        parts = content.split("---", 2)
-        if len(parts) < 3:
+        # Only locate the closing delimiter; the body is never copied.
+        end = content.find("\n---", 3)
+        if end < 0:
             return None
 
-        frontmatter = yaml.safe_load(parts[1])
-        return frontmatter if frontmatter else {}
+        return yaml.load(content[3:end], Loader=SafeLoader) or {}
     except Exception as e:
         print(f"  ❌ Error parsing {file_path.name}: {e}")
         return None
 
-def validate_agent(agent_name: str, frontmatter: Dict, schema: Dict) -> Tuple[bool, List[str]]:
-    """Validate agent frontmatter against schema."""
+def structural_errors(frontmatter: Dict, schema: Dict) -> List[str]:
+    """Hand-rolled required-field checks; reports every problem found."""
     errors = []
-    warnings = []
 
     # Check required fields
     required_fields = schema.get("required", [])
@@ -63,16 +83,6 @@ def validate_agent(agent_name: str, frontmatter: Dict, schema: Dict) -> Tuple[bo
         if field not in frontmatter:
             errors.append(f"Missing required field: '{field}'")
 
-    # Check for deprecated fields
-    if "skills" in frontmatter:
-        warnings.append("DEPRECATED: 'skills' field should be removed (use core_skills / preferred_skills / capable_skills).")
-    if "static_skills" in frontmatter:
-        warnings.append("REMOVED: 'static_skills' is no longer used. Use core_skills / preferred_skills / capable_skills.")
-    if "capabilities" in frontmatter:
-        warnings.append("REMOVED: 'capabilities' bundles are gone. Distribute skills directly into core_skills / preferred_skills / capable_skills.")
-    if "context" in frontmatter:
-        warnings.append("REMOVED: 'context' block (including file_globs) is no longer used by the engine.")
-
     # Check identity structure
     if "identity" in frontmatter:
         identity = frontmatter["identity"]
@@ -89,6 +99,47 @@ def validate_agent(agent_name: str, frontmatter: Dict, schema: Dict) -> Tuple[bo
         if "trigger_command" not in routing:
             errors.append("Missing routing.trigger_command")
 
+    return errors
+
+def validate_agent(
+    agent_name: str,
+    frontmatter: Dict,
+    schema: Dict,
+    validate_fn: Optional[Callable[[dict], dict]] = None,
+) -> Tuple[bool, List[str]]:
+    """Validate agent frontmatter against schema.
+
+    ``validate_fn`` is the compiled validator from ``compile_validator()``;
+    pass the same instance for every agent so the schema is compiled once.
+    """
+    errors = []
+    warnings = []
+    schema_error = None
+
+    errors.extend(structural_errors(frontmatter, schema))
+    if validate_fn is not None:
+        try:
+            validate_fn(frontmatter)
+        except fastjsonschema.JsonSchemaException as e:
+            # fastjsonschema stops at the first violation, usually one the
+            # hand-rolled checks in this function also report. Its message is
+            # kept only if they find nothing, so the output is the same with
+            # or without the package.
+            if getattr(e, "name", None):
+                schema_error = f"Schema violation at '{e.name}': {e.message}"
+            else:
+                schema_error = f"Schema violation: {e.message}"
+
+    # Check for deprecated fields
+    if "skills" in frontmatter:
+        warnings.append("DEPRECATED: 'skills' field should be removed (use core_skills / preferred_skills / capable_skills).")
+    if "static_skills" in frontmatter:
+        warnings.append("REMOVED: 'static_skills' is no longer used. Use core_skills / preferred_skills / capable_skills.")
+    if "capabilities" in frontmatter:
+        warnings.append("REMOVED: 'capabilities' bundles are gone. Distribute skills directly into core_skills / preferred_skills / capable_skills.")
+    if "context" in frontmatter:
+        warnings.append("REMOVED: 'context' block (including file_globs) is no longer used by the engine.")
+
     # Check core_skills / preferred_skills / capable_skills
     for field_name in ("core_skills", "preferred_skills", "capable_skills"):
         if field_name in frontmatter:
@@ -116,8 +167,27 @@ def validate_agent(agent_name: str, frontmatter: Dict, schema: Dict) -> Tuple[bo
                 elif not IMPLANT_ID_RE.match(imp):
                     errors.append(f"preferred_implants entry '{imp}' must match {IMPLANT_ID_RE.pattern}")
 
+    if schema_error and not errors:
+        errors.append(schema_error)
+
     return (len(errors) == 0, errors + warnings)
 
+def _process_agent(
+    agent_name: str,
+    prompt_path: Path,
+    schema: Dict,
+    validate_fn: Optional[Callable[[dict], dict]],
+) -> Tuple[str, Optional[bool], List[str]]:
+    """Read + validate one agent. ``is_valid`` is None when frontmatter is missing.
+
+    Runs on a worker thread: ``schema`` and ``validate_fn`` are shared read-only.
+    """
+    frontmatter = extract_frontmatter(prompt_path)
+    if frontmatter is None:
+        return agent_name, None, ["No frontmatter found"]
+    is_valid, messages = validate_agent(agent_name, frontmatter, schema, validate_fn)
+    return agent_name, is_valid, messages
+
 def main():
     """Main validation routine."""
     print("🔍 Validating Agent Frontmatter...")
@@ -128,6 +198,7 @@ def main():
     # Load schema
     try:
         schema = load_schema()
+        validate_fn = compile_validator(schema)
     except Exception as e:
         print(f"❌ Failed to load schema: {e}")
         return 1
@@ -146,21 +217,24 @@ def main():
 
     print(f"Found {len(agents)} agents\n")
 
-    # Validate each agent
+    # Validate each agent — file reads + YAML parsing overlap across threads;
+    # map() yields in submission order, so output stays sorted by name.
     all_valid = True
     results = []
 
-    for agent_name, prompt_path in sorted(agents):
-        frontmatter = extract_frontmatter(prompt_path)
+    with ThreadPoolExecutor(max_workers=min(32, len(agents))) as ex:
+        processed = list(ex.map(
+            lambda item: _process_agent(item[0], item[1], schema, validate_fn),
+            sorted(agents),
+        ))
 
-        if frontmatter is None:
+    for agent_name, is_valid, messages in processed:
+        if is_valid is None:
             print(f"❌ {agent_name}: No valid frontmatter")
             all_valid = False
-            results.append((agent_name, False, ["No frontmatter found"]))
+            results.append((agent_name, False, messages))
             continue
 
-        is_valid, messages = validate_agent(agent_name, frontmatter, schema)
-
         if is_valid:
             print(f"✅ {agent_name}")
         else:
@@ -0,0 +1,141 @@
+"""Shared plumbing for the .mdc vector indexes (skills, implants)."""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+from src.engine.config import EMBEDDING_MODEL
+from src.engine.embedder import embed_texts
+from src.engine.vector_store import NumpyVectorStore
+from src.utils.prompt_loader import split_frontmatter
+
+logger = logging.getLogger(__name__)
+
+
+class ParsedMdc(NamedTuple):
+    digest: str                   # sha256 of the raw file content
+    frontmatter: Dict[str, Any]   # {} when missing or unparsable
+    body: str                     # content without the frontmatter block
+
+
+# Parsed files keyed by path, stored with the st_mtime_ns they were read at.
+# Reindexing in the same process skips reading and parsing files that haven't
+# been touched; an edit overwrites the entry in place, so the cache holds at
+# most one entry per file.
+_parse_cache: Dict[str, tuple[int, ParsedMdc]] = {}
+
+
+def parse_mdc_file(file_path: str) -> ParsedMdc:
+    """Read and split one .mdc file. Raises OSError / UnicodeDecodeError.
+
+    Safe to call from worker threads. The returned frontmatter dict is
+    shared with the cache and must not be mutated.
+    """
+    mtime = os.stat(file_path).st_mtime_ns
+    cached = _parse_cache.get(file_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    frontmatter: Dict[str, Any] = {}
+    body = content
+    fm_str, parsed_body = split_frontmatter(content)
+    if fm_str is not None:
+        try:
+            frontmatter = yaml.load(fm_str, Loader=SafeLoader) or {}
+            body = parsed_body
+        except Exception as e:
+            logger.error(f"Failed to parse frontmatter for {file_path}: {e}")
+
+    parsed = ParsedMdc(hashlib.sha256(content.encode("utf-8")).hexdigest(), frontmatter, body)
+    _parse_cache[file_path] = (mtime, parsed)
+    return parsed
+
+
+def load_manifest(path: str) -> Dict[str, str]:
+    """Return {filename: sha256} from the last index; empty if missing,
+    unreadable, or built with a different embedding model."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("model") != EMBEDDING_MODEL:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_manifest(path: str, files: Dict[str, str]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"model": EMBEDDING_MODEL, "files": files}, f)
+
+
+# (filename, sha256, full_text, metadata) as built by each retriever's
+# _read_and_parse; None for files that couldn't be read.
+Entry = Optional[Tuple[str, str, str, Dict[str, Any]]]
+
+
+def replace_index(
+    store: NumpyVectorStore,
+    entries: Iterable[Entry],
+    manifest_path: str,
+    kind: str,
+) -> int:
+    """Replace *store* with *entries* and save it along with the manifest.
+
+    Only entries whose digest differs from the previous manifest are
+    re-embedded; vectors for the rest are reused from the store. With no
+    entries the store is cleared. Returns the number of entries indexed.
+    """
+    documents = []
+    metadatas = []
+    ids = []
+    digests: Dict[str, str] = {}
+    for entry in entries:
+        if entry is None:
+            continue
+        filename, digest, full_text, metadata = entry
+        digests[filename] = digest
+        documents.append(full_text)
+        metadatas.append(metadata)
+        ids.append(filename)
+        logger.info(f"Indexed {kind}: {filename}")
+
+    if not documents:
+        store.clear()
+        store.save()
+        save_manifest(manifest_path, {})
+        return 0
+
+    previous = load_manifest(manifest_path)
+    reused = store.get_embeddings(
+        [id_ for id_ in ids if previous.get(id_) == digests[id_]]
+    )
+    stale = [i for i, id_ in enumerate(ids) if id_ not in reused]
+    fresh = embed_texts([documents[i] for i in stale]) if stale else []
+    fresh_by_id = {ids[i]: fresh[k] for k, i in enumerate(stale)}
+    embeddings = np.stack([reused.get(id_, fresh_by_id.get(id_)) for id_ in ids])
+    logger.info(f"Embedded {len(stale)} changed {kind} files, reused {len(reused)} unchanged.")
+
+    store.replace(
+        ids=ids,
+        embeddings=embeddings,
+        documents=documents,
+        metadatas=metadatas,
+    )
+    store.save()
+    save_manifest(manifest_path, digests)
+    return len(documents)
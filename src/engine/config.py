@@ -19,6 +19,10 @@ AGENTS_DIR = os.path.join(INSTALL_ROOT, "agents")
 SKILLS_DIR = os.path.join(INSTALL_ROOT, "skills")
 IMPLANTS_DIR = os.path.join(INSTALL_ROOT, "implants")
 RULES_DIR = os.path.join(INSTALL_ROOT, "rules")
+# Persistent langdetect results (see src/engine/language.py).
+LANGUAGE_CACHE_PATH = os.path.join(INSTALL_DATA_DIR, "language_cache.sqlite3")
+# Persistent query embeddings (see src/engine/embedder.py).
+EMBED_CACHE_PATH = os.path.join(INSTALL_DATA_DIR, "embed_cache.sqlite3")
 
 # --- Client repo root (per-session, per-repo memory artifacts) ---------------
 # Where the serving MCP session's journal lives: history.md, history/ archive,
@@ -156,9 +160,39 @@ IMPLANTS_RELEVANCE_THRESHOLD = _float_env("IMPLANTS_RELEVANCE_THRESHOLD", 0.85)
 MAX_PREFERRED_IMPLANTS = 5
 IMPLANTS_DEEP_TIER_DEFAULT = 3
 
-SESSION_CACHE_MAX_SIZE = 128
 SESSION_CACHE_TTL_SECONDS = 600
 
+
+def _int_env(name: str, default: int, lo: int = 1, hi: int = 256) -> int:
+    """Parse an int from an env var, falling back to *default* on bad values or out-of-range."""
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning("Invalid value for %s=%r, using default %d", name, raw, default)
+        return default
+    if not (lo <= value <= hi):
+        logger.warning("Out-of-range value for %s=%d (expected %d–%d), using default %d", name, value, lo, hi, default)
+        return default
+    return value
+
+
+# Worker threads for blocking retrieval work (query embedding + vector store
+# search/writes). Kept separate from asyncio's default executor so a burst of
+# retrievals can't queue behind, or starve, unrelated file I/O offloads.
+RETRIEVAL_POOL_SIZE = _int_env("RETRIEVAL_POOL_SIZE", 8)
+
+# ONNX Runtime intra-op threads for the shared embedding session. 0 keeps
+# ORT's default (all physical cores per call); with several retrieval
+# workers embedding at once, a small value avoids thread oversubscription.
+EMBED_THREADS = _int_env("EMBED_THREADS", 0, lo=0)
+
+# Enriched prompts kept in the server's session cache (LRU + TTL). Each entry
+# is a full system prompt (tens of KB), so this bounds the cache's memory.
+SESSION_CACHE_MAX_SIZE = _int_env("SESSION_CACHE_SIZE", 128, hi=4096)
+
 # Debug logging — set AGENTS_DEBUG=1 in .env to write per-call JSON files to logs/
 AGENTS_DEBUG = os.getenv("AGENTS_DEBUG", "").lower() in ("1", "true")
 
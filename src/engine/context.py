@@ -4,6 +4,72 @@ from src.utils.langfuse_compat import observe
 
 logger = logging.getLogger(__name__)
 
+
+class HistoryText:
+    """Lazy ``"\n".join(history)``.
+
+    Consumers mostly need only the tail (the router and implant retriever
+    take the last few hundred characters), so the full join is deferred
+    until the text is actually stringified. Tail slices like ``ht[-300:]``
+    join just the trailing lines needed; anything else materializes once.
+    """
+
+    __slots__ = ("_lines", "_text")
+
+    def __init__(self, lines: List[str]):
+        self._lines = lines
+        self._text: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "\n".join(self._lines)
+        return self._text
+
+    def __len__(self) -> int:
+        if self._text is not None:
+            return len(self._text)
+        return sum(map(len, self._lines)) + max(len(self._lines) - 1, 0)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, HistoryText):
+            other = str(other)
+        return str(self) == other if isinstance(other, str) else NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __repr__(self) -> str:
+        return f"HistoryText({len(self._lines)} lines)"
+
+    def __getitem__(self, key):
+        if (
+            isinstance(key, slice)
+            and self._text is None
+            and key.stop is None
+            and key.step is None
+            and isinstance(key.start, int)
+            and key.start < 0
+        ):
+            return self.tail_chars(-key.start)
+        return str(self)[key]
+
+    def tail_chars(self, n: int) -> str:
+        """Last *n* characters of the joined history, joining only the lines needed."""
+        if self._text is not None:
+            return self._text[-n:] if n > 0 else ""
+        if n <= 0:
+            return ""
+        size = 0
+        start = len(self._lines)
+        while start > 0 and size < n:
+            start -= 1
+            size += len(self._lines[start]) + 1
+        return "\n".join(self._lines[start:])[-n:]
+
+
 class ContextRetriever:
     """
     Retrieves and formats context for the conversation (history, memories, etc.).
@@ -21,8 +87,8 @@ class ContextRetriever:
         if history is None:
             history = []
 
-        # 1. Format History
-        formatted_history = "\n".join(history) if history else ""
+        # 1. Format History (joined lazily — most consumers only read the tail)
+        formatted_history = HistoryText(history)
         
         # Placeholder for future RAG/Memory retrieval
         # relevant_memories = memory_store.search(query)
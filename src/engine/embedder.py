@@ -9,16 +9,20 @@ to apply model-specific instruction prefixes (e.g. "query: " / "passage: ").
 """
 
 import glob
+import hashlib
 import logging
 import os
 import shutil
+import sqlite3
 import threading
 import warnings
-from typing import List
+from concurrent.futures import Future
+from typing import List, Optional
 
 import numpy as np
+from cachetools import LRUCache
 
-from src.engine.config import EMBEDDING_MODEL, FASTEMBED_CACHE_DIR
+from src.engine.config import EMBED_CACHE_PATH, EMBED_THREADS, EMBEDDING_MODEL, FASTEMBED_CACHE_DIR
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +42,26 @@ def clear_model_cache(model_name: str) -> None:
 
 _MAX_LOAD_RETRIES = 2
 
+# Documents per ONNX forward pass when indexing. BERT-sized encoders scale
+# close to linearly up to ~64; larger batches mostly cost padding memory.
+EMBED_BATCH_SIZE = 64
+
+# One turn embeds the same text from several places (router lookup, skill
+# retrieval, router cache update), and retries/handoffs repeat whole turns,
+# so query vectors are memoized in memory by a hash of (model, text) and
+# spilled to SQLite so restarts start warm.
+_QUERY_CACHE_SIZE = 4096
+_DISK_CACHE_MAX_ROWS = 10000
+_DISK_CACHE_PRUNE_EVERY = 256
+
+_query_cache: LRUCache = LRUCache(maxsize=_QUERY_CACHE_SIZE)
+_query_cache_lock = threading.Lock()
+# Misses currently being embedded, so concurrent callers with the same text
+# (e.g. skills and implants retrieval running in parallel) wait for one
+# model call instead of each running their own.
+_inflight: dict = {}
+_disk_cache: Optional["_VectorDiskCache"] = None
+
 
 def _get_model():
     """Lazy-init singleton TextEmbedding instance.
@@ -59,7 +83,11 @@ def _get_model():
                         logger.info("Loading embedding model: %s (attempt %d)", EMBEDDING_MODEL, attempt + 1)
                         with warnings.catch_warnings():
                             warnings.filterwarnings("ignore", message=".*now uses mean pooling.*")
-                            _model = TextEmbedding(model_name=EMBEDDING_MODEL, cache_dir=FASTEMBED_CACHE_DIR)
+                            _model = TextEmbedding(
+                                model_name=EMBEDDING_MODEL,
+                                cache_dir=FASTEMBED_CACHE_DIR,
+                                threads=EMBED_THREADS or None,
+                            )
                         logger.info("Embedding model loaded")
                         break
                     except Exception:
@@ -79,19 +107,126 @@ def reset_model():
     global _model
     with _lock:
         _model = None
+    with _query_cache_lock:
+        _query_cache.clear()
 
 
-def embed_texts(texts: List[str]) -> np.ndarray:
-    """Embed documents/passages. Returns (N, D) numpy array."""
+def embed_texts(texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+    """Embed documents/passages in fixed-size batches. Returns (N, D) numpy array."""
     model = _get_model()
-    return np.array(list(model.passage_embed(texts)))
+    return np.array(list(model.passage_embed(texts, batch_size=batch_size)))
+
+
+class _VectorDiskCache:
+    """SQLite-backed ``key -> float32 vector`` store shared across processes.
+
+    Best-effort like the language cache: any SQLite/OS error is logged and
+    the cache degrades to a no-op. Oldest rows are pruned past
+    ``_DISK_CACHE_MAX_ROWS``.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_vectors "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn = conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Embedding cache unavailable at %s: %s", path, e)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT vector FROM query_vectors WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("Embedding cache read failed: %s", e)
+            return None
+        return np.frombuffer(row[0], dtype=np.float32) if row else None
+
+    def set(self, key: str, vec: np.ndarray) -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO query_vectors (key, vector) VALUES (?, ?)",
+                    (key, np.asarray(vec, dtype=np.float32).tobytes()),
+                )
+                self._writes += 1
+                if self._writes % _DISK_CACHE_PRUNE_EVERY == 0:
+                    self._conn.execute(
+                        "DELETE FROM query_vectors WHERE rowid <= "
+                        "(SELECT MAX(rowid) FROM query_vectors) - ?",
+                        (_DISK_CACHE_MAX_ROWS,),
+                    )
+        except sqlite3.Error as e:
+            logger.debug("Embedding cache write failed: %s", e)
+
+
+def _get_disk_cache() -> "_VectorDiskCache":
+    global _disk_cache
+    if _disk_cache is None:
+        with _lock:
+            if _disk_cache is None:
+                _disk_cache = _VectorDiskCache(EMBED_CACHE_PATH)
+    return _disk_cache
+
+
+def _query_key(text: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(EMBEDDING_MODEL.encode("utf-8"))
+    h.update(b"\0")
+    h.update(text.encode("utf-8"))
+    return h.hexdigest()
 
 
 def embed_query(text: str) -> np.ndarray:
-    """Embed a single query. Returns (D,) numpy array.
+    """Embed a single query. Returns a read-only (D,) numpy array.
 
     Uses query_embed() which adds model-specific query prefixes
-    for better retrieval quality.
+    for better retrieval quality. Results are memoized by a hash of
+    (model, text) in memory and on disk, so repeated queries — within a
+    turn, across retries, or after a restart — skip the model.
     """
-    model = _get_model()
-    return np.array(list(model.query_embed([text])))[0]
+    key = _query_key(text)
+    with _query_cache_lock:
+        vec = _query_cache.get(key)
+        if vec is not None:
+            return vec
+        pending = _inflight.get(key)
+        if pending is None:
+            pending = _inflight[key] = Future()
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        return pending.result()
+
+    try:
+        disk = _get_disk_cache()
+        vec = disk.get(key)
+        if vec is None:
+            model = _get_model()
+            vec = np.array(list(model.query_embed([text])))[0]
+            disk.set(key, vec)
+        vec.setflags(write=False)  # shared by every caller that hits the cache
+        with _query_cache_lock:
+            _query_cache[key] = vec
+        pending.set_result(vec)
+        return vec
+    except BaseException as e:
+        pending.set_exception(e)
+        raise
+    finally:
+        with _query_cache_lock:
+            _inflight.pop(key, None)
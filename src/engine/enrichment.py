@@ -33,6 +33,7 @@ from src.engine.config import AGENTS_DEBUG, get_debug_log_dir
 from src.engine.implants import ImplantRetriever
 from src.engine.rules import format_rules_for_prompt, get_rules
 from src.engine.skills import SkillRetriever
+from src.engine.vector_store import RETRIEVAL_EXECUTOR
 
 logger = logging.getLogger(__name__)
 
@@ -109,34 +110,10 @@ async def get_dynamic_context_string(
     except Exception as e:
         logger.error("Failed to load rules layer: %s", e, exc_info=True)
 
-    # --- Skills layer (3-tier per-agent model) ----------------------------
-    # Core skills load on every tier (including lite) — they're the agent's
-    # mandatory baseline. Preferred + capable participate in semantic search
-    # only when tier permits (n_results > 0).
-    try:
-        n_results = _n_results_for_tier(tier)
-        skills = await loop.run_in_executor(
-            None,
-            lambda: skill_retriever.retrieve(
-                query,
-                mandatory=core_skills or None,
-                preferred=preferred_skills or None,
-                capable=capable_skills or None,
-                n_results=n_results,
-            ),
-        )
-        if skills:
-            use_compiled = tier == "standard"
-            context_parts.append(
-                skill_retriever.format_skills_for_prompt(skills, compiled=use_compiled)
-            )
-            loaded_skill_names = [
-                s.get("filename", "unknown").removesuffix(".mdc") for s in skills
-            ]
-    except Exception as e:
-        logger.error("Failed to retrieve skills: %s", e, exc_info=True)
-
-    # --- Implants layer (standard/deep only) ------------------------------
+    # --- Implants retrieval (standard/deep only), started early ----------
+    # Skills and implants are independent vector searches over the same
+    # query, so the implant search runs on the pool while skills resolve.
+    implants_future = None
     if tier in ("standard", "deep"):
         try:
             from src.engine.config import (
@@ -161,8 +138,8 @@ async def get_dynamic_context_string(
                 tier, n_implants, preferred_implants,
             )
             _preferred = preferred_implants  # capture for closure
-            implants = await loop.run_in_executor(
-                None,
+            implants_future = loop.run_in_executor(
+                RETRIEVAL_EXECUTOR,
                 lambda: implant_retriever.retrieve(
                     query,
                     n_results=n_implants,
@@ -170,6 +147,40 @@ async def get_dynamic_context_string(
                     preferred_implants=_preferred if _preferred else None,
                 ),
             )
+        except Exception as e:
+            logger.error("Failed to start implant retrieval: %s", e, exc_info=True)
+
+    # --- Skills layer (3-tier per-agent model) ----------------------------
+    # Core skills load on every tier (including lite) — they're the agent's
+    # mandatory baseline. Preferred + capable participate in semantic search
+    # only when tier permits (n_results > 0).
+    try:
+        n_results = _n_results_for_tier(tier)
+        skills = await loop.run_in_executor(
+            RETRIEVAL_EXECUTOR,
+            lambda: skill_retriever.retrieve(
+                query,
+                mandatory=core_skills or None,
+                preferred=preferred_skills or None,
+                capable=capable_skills or None,
+                n_results=n_results,
+            ),
+        )
+        if skills:
+            use_compiled = tier == "standard"
+            context_parts.append(
+                skill_retriever.format_skills_for_prompt(skills, compiled=use_compiled)
+            )
+            loaded_skill_names = [
+                s.get("filename", "unknown").removesuffix(".mdc") for s in skills
+            ]
+    except Exception as e:
+        logger.error("Failed to retrieve skills: %s", e, exc_info=True)
+
+    # --- Implants layer (standard/deep only) ------------------------------
+    if implants_future is not None:
+        try:
+            implants = await implants_future
             logger.debug("Implants retrieved: %d results", len(implants))
             if implants:
                 context_parts.append(implant_retriever.format_implants_for_prompt(implants))
@@ -1,28 +1,32 @@
 import logging
 import os
-import glob
 import hashlib
-import yaml
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from src.utils.langfuse_compat import observe
 from typing import List, Dict, Any, Optional
-from src.utils.prompt_loader import split_frontmatter
 
-from src.engine.config import IMPLANTS_DIR, IMPLANTS_RELEVANCE_THRESHOLD, DATA_DIR
+from src.engine._indexing import parse_mdc_file, replace_index
+from src.engine.config import IMPLANTS_DIR, IMPLANTS_RELEVANCE_THRESHOLD, INSTALL_DATA_DIR, EMBEDDING_MODEL
 from src.engine.vector_store import NumpyVectorStore
-from src.engine.embedder import embed_texts, embed_query
+from src.engine.embedder import embed_query
 
 logger = logging.getLogger(__name__)
 
+
 class ImplantRetriever:
-    HASH_FILE = os.path.join(DATA_DIR, ".implants_hash")
+    HASH_FILE = os.path.join(INSTALL_DATA_DIR, ".implants_hash")
+    # Per-file content digests of the last index, so a reindex only embeds
+    # implants that actually changed and reuses stored vectors for the rest.
+    MANIFEST_FILE = os.path.join(INSTALL_DATA_DIR, ".implants_manifest.json")
 
     def __init__(self):
-        self.store = NumpyVectorStore(name="implants_store", data_dir=DATA_DIR)
+        self.store = NumpyVectorStore(name="implants_store", data_dir=INSTALL_DATA_DIR)
 
         changed, self._current_hash = self._needs_reindex()
         # Also reindex if store is empty but .mdc files exist (corrupted/missing store)
         if not changed and self.store.count() == 0:
-            if glob.glob(os.path.join(IMPLANTS_DIR, "*.mdc")):
+            if self._list_implant_files():
                 changed = True
                 logger.info("Implants store empty despite hash match — forcing reindex")
         if changed:
@@ -30,11 +34,22 @@ class ImplantRetriever:
             self.index_implants()
 
     @staticmethod
-    def _compute_dir_hash() -> str:
-        from src.engine.config import EMBEDDING_MODEL
+    def _list_implant_files() -> List[str]:
+        """Sorted paths of the top-level .mdc files in IMPLANTS_DIR (flat scandir, no fnmatch)."""
+        try:
+            with os.scandir(IMPLANTS_DIR) as it:
+                return sorted(
+                    e.path for e in it
+                    if e.name.endswith(".mdc") and not e.name.startswith(".") and e.is_file()
+                )
+        except FileNotFoundError:
+            return []
+
+    @classmethod
+    def _compute_dir_hash(cls) -> str:
         h = hashlib.md5()
         h.update(EMBEDDING_MODEL.encode())
-        for path in sorted(glob.glob(os.path.join(IMPLANTS_DIR, "*.mdc"))):
+        for path in cls._list_implant_files():
             h.update(path.encode())
             with open(path, "rb") as f:
                 h.update(f.read())
@@ -55,83 +70,55 @@ class ImplantRetriever:
         with open(self.HASH_FILE, "w") as f:
             f.write(digest or self._compute_dir_hash())
 
+    @staticmethod
+    def _read_and_parse(file_path: str) -> Optional[tuple[str, str, str, Dict[str, Any]]]:
+        """Read one implant file and return (filename, sha256, full_text, metadata),
+        or None if it can't be read. Runs on a worker thread."""
+        try:
+            digest, frontmatter, body = parse_mdc_file(file_path)
+
+            # Prepare for indexing
+            description = frontmatter.get("description", "")
+            full_text = f"{description}\n\n{body}"
+
+            filename = os.path.basename(file_path)
+            metadata = {
+                "filename": filename,
+                "description": description,
+                "path": file_path,
+                "body": body,
+                "short_name": frontmatter.get("short_name", ""),
+                "one_liner": frontmatter.get("one_liner", ""),
+            }
+            return filename, digest, full_text, metadata
+
+        except Exception as e:
+            logger.error(f"Error processing implant file {file_path}: {e}")
+            return None
+
     def index_implants(self):
         """
         Reads all .mdc files in IMPLANTS_DIR and indexes them.
+        Only files whose content changed since the last index are re-embedded.
         """
-        implant_files = glob.glob(os.path.join(IMPLANTS_DIR, "*.mdc"))
+        implant_files = self._list_implant_files()
 
         if not implant_files:
             logger.warning(f"No implant files found in {IMPLANTS_DIR}")
-            self.store.clear()
-            self.store.save()
+            replace_index(self.store, [], self.MANIFEST_FILE, "implant")
             self._save_hash(getattr(self, "_current_hash", None))
             return
 
-        documents = []
-        metadatas = []
-        ids = []
-
-        for file_path in implant_files:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Parse frontmatter
-                frontmatter = {}
-                body = content
-
-                fm_str, parsed_body = split_frontmatter(content)
-                if fm_str is not None:
-                    try:
-                        frontmatter = yaml.safe_load(fm_str) or {}
-                        body = parsed_body
-                    except Exception as e:
-                        logger.error(f"Failed to parse frontmatter for {file_path}: {e}")
-
-                # Prepare for indexing
-                description = frontmatter.get("description", "")
-                full_text = f"{description}\n\n{body}"
-
-                filename = os.path.basename(file_path)
-
-                short_name = frontmatter.get("short_name", "")
-                one_liner = frontmatter.get("one_liner", "")
-
-                documents.append(full_text)
-                metadatas.append({
-                    "filename": filename,
-                    "description": description,
-                    "path": file_path,
-                    "body": body,
-                    "short_name": short_name,
-                    "one_liner": one_liner,
-                })
-                ids.append(filename)
+        with ThreadPoolExecutor(max_workers=min(16, len(implant_files))) as ex:
+            parsed = list(ex.map(self._read_and_parse, implant_files))
 
-                logger.info(f"Indexed implant: {filename}")
-
-            except Exception as e:
-                logger.error(f"Error processing implant file {file_path}: {e}")
-
-        if not documents:
-            # All files failed to parse — clear stale store
-            self.store.clear()
-            self.store.save()
-            self._save_hash(getattr(self, "_current_hash", None))
-            logger.warning("No implants could be parsed — store cleared")
-            return
-
-        embeddings = embed_texts(documents)
-        self.store.replace(
-            ids=ids,
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadatas,
-        )
-        self.store.save()
+        count = replace_index(self.store, parsed, self.MANIFEST_FILE, "implant")
         self._save_hash(getattr(self, "_current_hash", None))
-        logger.info(f"Successfully indexed {len(documents)} implants.")
+        if count:
+            logger.info(f"Successfully indexed {count} implants.")
+        else:
+            # All files failed to parse — stale store was cleared
+            logger.warning("No implants could be parsed — store cleared")
 
     @observe(name="retrieve_implants")
     def retrieve(self, query: str, n_results: int = 3, context: Optional[Dict[str, Any]] = None, role: Optional[str] = None, agent_context: Optional[str] = None, preferred_implants: Optional[List[str]] = None) -> List[Dict[str, Any]]:
@@ -221,20 +208,23 @@ class ImplantRetriever:
                     IMPLANTS_RELEVANCE_THRESHOLD,
                     [(cid, f"{d:.4f}") for cid, d in zip(candidates.ids, candidates.distances)],
                 )
-            for i, distance in enumerate(candidates.distances):
-                if distance < IMPLANTS_RELEVANCE_THRESHOLD:
-                    cid = candidates.ids[i]
-                    # Skip implants already loaded via preferred path
-                    if cid in preferred_ids_loaded:
-                        continue
-                    meta = candidates.metadatas[i] or {}
-                    content = meta.get('body', candidates.documents[i])
-                    semantic_implants.append({
-                        "filename": cid,
-                        "content": content,
-                        "metadata": meta,
-                        "distance": distance,
-                    })
+            # Vectorized threshold: only rows that pass are touched below.
+            keep_idx = np.flatnonzero(
+                np.asarray(candidates.distances) < IMPLANTS_RELEVANCE_THRESHOLD
+            )
+            for i in keep_idx:
+                cid = candidates.ids[i]
+                # Skip implants already loaded via preferred path
+                if cid in preferred_ids_loaded:
+                    continue
+                meta = candidates.metadatas[i] or {}
+                content = meta.get('body', candidates.documents[i])
+                semantic_implants.append({
+                    "filename": cid,
+                    "content": content,
+                    "metadata": meta,
+                    "distance": candidates.distances[i],
+                })
 
         semantic_implants.sort(key=lambda x: x["distance"])
         semantic_implants = semantic_implants[:n_results]
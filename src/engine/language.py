@@ -1,14 +1,26 @@
+import hashlib
 import logging
+import os
+import sqlite3
+import sys
+import threading
+from bisect import bisect_right
+from collections import Counter
+from types import MappingProxyType
 from typing import Optional
 from functools import lru_cache
 
+from src.engine.config import LANGUAGE_CACHE_PATH
+
 logger = logging.getLogger(__name__)
 
 # Default language when detection fails or is ambiguous
-DEFAULT_LANGUAGE = "English"
+DEFAULT_LANGUAGE = sys.intern("English")
 
-# ISO 639-1 code to full language name mapping
-LANG_MAP = {
+# ISO 639-1 code to full language name mapping. Read-only, with interned
+# names so every detection (and every cache entry) shares one object per
+# language.
+_LANG_MAP_RAW = {
     "en": "English",
     "ru": "Russian",
     "de": "German",
@@ -34,6 +46,174 @@ LANG_MAP = {
     "el": "Greek",
     "he": "Hebrew",
 }
+LANG_MAP = MappingProxyType(
+    {sys.intern(k): sys.intern(v) for k, v in _LANG_MAP_RAW.items()}
+)
+del _LANG_MAP_RAW
+
+# langdetect is stable on prefixes, so only the head of the text is hashed.
+_CACHE_KEY_PREFIX_CHARS = 512
+# One row per distinct query prefix: prune the oldest past this many rows.
+_DISK_CACHE_MAX_ROWS = 10000
+_DISK_CACHE_PRUNE_EVERY = 256
+
+
+def _cache_key(text: str) -> str:
+    prefix = text[:_CACHE_KEY_PREFIX_CHARS]
+    return hashlib.blake2b(prefix.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# --- Script fast path ---------------------------------------------------------
+# Non-Latin scripts that identify a LANG_MAP language (almost) on their own.
+# Sorted by range start for bisect. Latin text never matches — telling
+# EN/DE/FR/... apart needs langdetect's n-gram model. Arabic and Devanagari
+# are left out on purpose: they are shared with languages outside LANG_MAP
+# (Persian, Urdu, Marathi, Nepali), which langdetect maps to the default.
+_SCRIPT_RANGES = (
+    (0x0370, 0x03FF, "GREEK"),
+    (0x0400, 0x04FF, "CYRILLIC"),
+    (0x0590, 0x05FF, "HEBREW"),
+    (0x1100, 0x11FF, "HANGUL"),
+    (0x1F00, 0x1FFF, "GREEK"),
+    (0x3040, 0x309F, "HIRAGANA"),
+    (0x30A0, 0x30FF, "KATAKANA"),
+    (0x3130, 0x318F, "HANGUL"),
+    (0x4E00, 0x9FFF, "CJK"),
+    (0xAC00, 0xD7AF, "HANGUL"),
+)
+_SCRIPT_RANGE_STARTS = tuple(lo for lo, _, _ in _SCRIPT_RANGES)
+_SCRIPT_LANGUAGE = {"GREEK": "Greek", "HEBREW": "Hebrew", "HANGUL": "Korean"}
+_FAST_PATH_MIN_RATIO = 0.9
+# Letters unique to one Cyrillic-script language in LANG_MAP. Text with none
+# of them (or both sets) is ambiguous and goes to langdetect.
+_RUSSIAN_ONLY = frozenset("ыэЫЭ")
+_UKRAINIAN_ONLY = frozenset("їєґЇЄҐ")
+
+
+def _script_at(codepoint: int) -> Optional[str]:
+    i = bisect_right(_SCRIPT_RANGE_STARTS, codepoint) - 1
+    if i >= 0 and codepoint <= _SCRIPT_RANGES[i][1]:
+        return _SCRIPT_RANGES[i][2]
+    return None
+
+
+def _fast_script_guess(text: str) -> Optional[str]:
+    """Return a language when >= 90% of letters sit in one telling script.
+
+    Scans at most the cache-key prefix. Returns None for Latin or mixed text
+    and for scripts shared by several languages without a distinguishing
+    letter, so the caller falls back to langdetect.
+    """
+    counts: Counter = Counter()
+    letters = 0
+    for ch in text[:_CACHE_KEY_PREFIX_CHARS]:
+        if ch.isalpha():
+            letters += 1
+            if ch >= "\u0370":
+                counts[_script_at(ord(ch))] += 1
+    if not letters:
+        return None
+
+    def ratio(*scripts: str) -> float:
+        return sum(counts[s] for s in scripts) / letters
+
+    if counts["HIRAGANA"] or counts["KATAKANA"]:
+        if ratio("HIRAGANA", "KATAKANA", "CJK") >= _FAST_PATH_MIN_RATIO:
+            return "Japanese"
+        return None
+    for script, language in _SCRIPT_LANGUAGE.items():
+        if ratio(script) >= _FAST_PATH_MIN_RATIO:
+            return language
+    if ratio("CYRILLIC") >= _FAST_PATH_MIN_RATIO:
+        sample = set(text[:_CACHE_KEY_PREFIX_CHARS])
+        is_ru = not sample.isdisjoint(_RUSSIAN_ONLY)
+        is_uk = not sample.isdisjoint(_UKRAINIAN_ONLY)
+        if is_ru != is_uk:
+            return "Russian" if is_ru else "Ukrainian"
+    return None
+
+
+class _DetectionCache:
+    """SQLite-backed ``key -> language`` store shared across processes.
+
+    Best-effort: any SQLite/OS error is logged and the cache degrades to a
+    no-op, so detection never fails because of it. Oldest rows are pruned
+    past ``_DISK_CACHE_MAX_ROWS``.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS detections "
+                "(key TEXT PRIMARY KEY, language TEXT NOT NULL)"
+            )
+            self._conn = conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Language cache unavailable at %s: %s", path, e)
+
+    def get(self, key: str) -> Optional[str]:
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT language FROM detections WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("Language cache read failed: %s", e)
+            return None
+        return sys.intern(row[0]) if row else None
+
+    def set(self, key: str, language: str) -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO detections (key, language) VALUES (?, ?)",
+                    (key, language),
+                )
+                self._writes += 1
+                if self._writes % _DISK_CACHE_PRUNE_EVERY == 0:
+                    self._conn.execute(
+                        "DELETE FROM detections WHERE rowid <= "
+                        "(SELECT MAX(rowid) FROM detections) - ?",
+                        (_DISK_CACHE_MAX_ROWS,),
+                    )
+        except sqlite3.Error as e:
+            logger.debug("Language cache write failed: %s", e)
+
+
+# Private langdetect factory shared by every LanguageDetector. Built from
+# the public DetectorFactory API instead of langdetect's module-level
+# ``_factory``, so no library internals are touched.
+_factory_lock = threading.Lock()
+_factory = None
+
+
+def _get_factory(langdetect):
+    """Load all bundled langdetect profiles once per process.
+
+    All profiles are kept: languages outside LANG_MAP must still win their
+    own text so it falls back to DEFAULT_LANGUAGE instead of being forced
+    onto the nearest mapped profile.
+    """
+    global _factory
+    if _factory is None:
+        with _factory_lock:
+            if _factory is None:
+                from langdetect.detector_factory import PROFILES_DIRECTORY
+
+                factory = langdetect.DetectorFactory()
+                factory.load_profile(PROFILES_DIRECTORY)
+                factory.set_seed(0)  # consistent results across runs
+                _factory = factory
+    return _factory
 
 
 class LanguageDetector:
@@ -41,19 +221,45 @@ class LanguageDetector:
     Detects the language of a given text using langdetect library.
     Returns human-readable language names (e.g., "Russian", "English").
     Falls back to English on detection failure or unmapped codes.
+
+    Results are memoized in-process (``lru_cache``) and persisted to an
+    on-disk SQLite cache so warm restarts skip the n-gram model entirely.
+    Text written in a script that identifies the language on its own
+    (Hangul, kana, Greek, Hebrew, Cyrillic with Russian/Ukrainian-only
+    letters) is answered by a character scan without calling langdetect.
     """
 
-    def __init__(self):
-        """Initialize the LanguageDetector."""
+    def __init__(self, cache_path: Optional[str] = None):
+        """Initialize the LanguageDetector.
+
+        Args:
+            cache_path: SQLite file for persisted detections. Defaults to
+                ``LANGUAGE_CACHE_PATH`` from config.
+        """
+        self._disk_cache = _DetectionCache(cache_path or LANGUAGE_CACHE_PATH)
         try:
             # Import langdetect only when needed to avoid import errors if not installed
             import langdetect
             self.langdetect = langdetect
-            # Set seed for consistent results across runs
-            langdetect.DetectorFactory.seed = 0
         except ImportError:
             logger.error("langdetect library not installed. Language detection will always return default.")
             self.langdetect = None
+            return
+
+        # Load profiles now rather than on the first user query.
+        self._factory = _get_factory(langdetect)
+
+    def _detect_iso(self, text: str) -> str:
+        """ISO code of the most probable language (raises LangDetectException)."""
+        detector = self._factory.create()
+        detector.append(text)
+        return detector.detect()
+
+    def _detect_probabilities(self, text: str) -> list:
+        """langdetect ``Language`` results, most probable first."""
+        detector = self._factory.create()
+        detector.append(text)
+        return detector.get_probabilities()
 
     @lru_cache(maxsize=1024)
     def detect(self, text: str) -> str:
@@ -82,9 +288,20 @@ class LanguageDetector:
             logger.debug(f"Text too short for reliable detection: '{cleaned_text}', using default")
             return DEFAULT_LANGUAGE
 
+        fast = _fast_script_guess(cleaned_text)
+        if fast is not None:
+            logger.debug(f"Detected language by script: {fast}")
+            return fast
+
+        key = _cache_key(cleaned_text)
+        cached = self._disk_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Language cache hit: {cached}")
+            return cached
+
         try:
             # Detect ISO code
-            iso_code = self.langdetect.detect(cleaned_text)
+            iso_code = self._detect_iso(cleaned_text)
             logger.debug(f"Detected ISO code: {iso_code}")
 
             # Map to full language name
@@ -92,10 +309,14 @@ class LanguageDetector:
 
             if language_name:
                 logger.info(f"Detected language: {language_name} (ISO: {iso_code})")
-                return language_name
             else:
                 logger.warning(f"Unmapped ISO code '{iso_code}', using default language")
-                return DEFAULT_LANGUAGE
+                language_name = DEFAULT_LANGUAGE
+
+            # Only successful detections are persisted — exceptions below
+            # may be transient and must not pin the fallback forever.
+            self._disk_cache.set(key, language_name)
+            return language_name
 
         except self.langdetect.LangDetectException as e:
             logger.warning(f"Language detection failed for text '{cleaned_text[:50]}...': {e}")
@@ -123,7 +344,7 @@ class LanguageDetector:
 
         try:
             # Get probabilities for all detected languages
-            probabilities = self.langdetect.detect_langs(text)
+            probabilities = self._detect_probabilities(text)
 
             if not probabilities:
                 return DEFAULT_LANGUAGE, 0.0
@@ -6,15 +6,17 @@ import threading
 from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any, Tuple
 
+import numpy as np
+
 from src.engine.config import (
     ROUTER_SIMILARITY_THRESHOLD, AGENTS_DIR, DATA_DIR, EMBEDDING_MODEL,
     KEYWORD_OVERRIDE_MIN_HITS, KEYWORD_UNIQUENESS_RATIO,
 )
 from src.engine.embedder import embed_query
-from src.engine.vector_store import NumpyVectorStore
+from src.engine.vector_store import NumpyVectorStore, RETRIEVAL_EXECUTOR
 from src.schemas.protocol import RouterDecision, AgentRequest
 from src.utils.langfuse_compat import observe
-from src.utils.prompt_loader import split_frontmatter
+from src.utils.prompt_loader import get_agent_metadata
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,23 @@ _ROUTER_MODEL_HASH_FILE = os.path.join(DATA_DIR, ".router_cache_model")
 # query_nearest() to trigger lazy self-heal.
 _DIM_MISMATCH_ERROR_FRAGMENT = "Dimension mismatch"
 
+# Agent directory scans keyed by agents_dir, stored with the st_mtime_ns of
+# agents_dir and of every candidate subdirectory at read time. Adding or
+# removing an agent directory bumps the parent mtime; adding or removing
+# system_prompt.mdc inside an existing one bumps that subdirectory's mtime.
+# Validating costs one stat per directory instead of a scandir walk plus a
+# stat per agent. A stale entry is overwritten in place. Agent frontmatter
+# comes from prompt_loader's mtime-keyed cache.
+_scan_cache: Dict[str, Tuple[Tuple[int, ...], List[str], List[str]]] = {}
+
+
+def _dir_stamps(paths: List[str]) -> Optional[Tuple[int, ...]]:
+    """st_mtime_ns for each path, or None if any of them can't be stat'ed."""
+    try:
+        return tuple(os.stat(p).st_mtime_ns for p in paths)
+    except OSError:
+        return None
+
 
 class SemanticRouter:
     def __init__(self):
@@ -35,7 +54,14 @@ class SemanticRouter:
         # writers. NumpyVectorStore has its own lock for in-memory state,
         # but doesn't span the marker write — this lock bridges that gap.
         self._marker_lock = threading.RLock()
-        self.store = NumpyVectorStore(name="router_cache", data_dir=DATA_DIR)
+        # Group commit for update_cache: every in-memory add bumps
+        # _dirty_gen; a flusher persists everything up to the current gen in
+        # one save, and callers whose gen is already covered skip theirs.
+        # Concurrent cache misses therefore share a single npz/json write.
+        self._flush_lock = threading.Lock()
+        self._dirty_gen = 0
+        self._saved_gen = 0
+        self.store = NumpyVectorStore(name="router_cache", data_dir=DATA_DIR, storage_dtype=np.float16)
         self._invalidate_on_model_change()
 
         self.available_agents = self._scan_agents()
@@ -181,10 +207,18 @@ class SemanticRouter:
             logger.warning(f"Agents directory not found at {agents_dir}. Fallback to universal_agent.")
             return ["universal_agent"]
 
+        cached = _scan_cache.get(agents_dir)
+        if cached is not None:
+            stamps, subdirs, agents = cached
+            if _dir_stamps([agents_dir, *subdirs]) == stamps:
+                return list(agents)
+
         agents = []
+        subdirs = []
         try:
             for entry in os.scandir(agents_dir):
                 if entry.is_dir() and not entry.name.startswith(".") and entry.name != "common":
+                    subdirs.append(entry.path)
                     # Check if it has a system_prompt.mdc
                     if os.path.exists(os.path.join(entry.path, "system_prompt.mdc")):
                         agents.append(entry.name)
@@ -197,20 +231,20 @@ class SemanticRouter:
             logger.warning("Agent scan returned empty. Falling back to universal_agent only.")
             return ["universal_agent"]
 
-        return sorted(agents)
+        agents.sort()
+        stamps = _dir_stamps([agents_dir, *subdirs])
+        if stamps is not None:
+            _scan_cache[agents_dir] = (stamps, subdirs, agents)
+        return list(agents)
 
     def _load_agent_descriptions(self) -> Dict[str, Dict[str, str]]:
         """Load display_name and role for each agent from frontmatter."""
-        import yaml
         descriptions = {}
         for name in self.available_agents:
-            path = os.path.join(AGENTS_DIR, name, "system_prompt.mdc")
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                fm_str, _ = split_frontmatter(content)
-                if fm_str is not None:
-                    meta = yaml.safe_load(fm_str) or {}
+                # Shared with the server's prompt loading: one parse per file
+                meta = get_agent_metadata(name)
+                if meta:
                     identity = meta.get("identity", {})
                     routing = meta.get("routing", {})
                     descriptions[name] = {
@@ -347,7 +381,7 @@ class SemanticRouter:
         semantic_query = f"{history_text[-200:]}\n{query}" if history_text else query
 
         loop = asyncio.get_running_loop()
-        query_emb = await loop.run_in_executor(None, embed_query, semantic_query)
+        query_emb = await loop.run_in_executor(RETRIEVAL_EXECUTOR, embed_query, semantic_query)
         # Ask for every neighbour the store holds, not just the top-K.
         # When a refactor deletes multiple agents at once, an arbitrary
         # number of stale entries can sit ahead of the first valid match.
@@ -361,7 +395,7 @@ class SemanticRouter:
         n_candidates = self.store.count()
         try:
             results = await loop.run_in_executor(
-                None, lambda: self.store.query(query_embedding=query_emb, n_results=n_candidates)
+                RETRIEVAL_EXECUTOR, lambda: self.store.query(query_embedding=query_emb, n_results=n_candidates)
             )
         except ValueError as e:
             # Self-heal a stale cache whose vectors disagree with the current
@@ -380,7 +414,7 @@ class SemanticRouter:
                 # store.query (no lock) and the wipe (lock acquired below).
                 embedder_dim = int(query_emb.shape[0])
                 await loop.run_in_executor(
-                    None, lambda: self._wipe_and_remark(expected_dim=embedder_dim)
+                    RETRIEVAL_EXECUTOR, lambda: self._wipe_and_remark(expected_dim=embedder_dim)
                 )
                 return None
             raise
@@ -456,7 +490,7 @@ class SemanticRouter:
         """
         loop = asyncio.get_running_loop()
         try:
-            query_emb = await loop.run_in_executor(None, embed_query, query)
+            query_emb = await loop.run_in_executor(RETRIEVAL_EXECUTOR, embed_query, query)
 
             add_kwargs = dict(
                 ids=[request_id],
@@ -469,11 +503,7 @@ class SemanticRouter:
                 }],
             )
 
-            def _mutate_and_save():
-                # Hold the router-level lock for the whole (store + marker)
-                # sequence so concurrent update_cache / _wipe_and_remark
-                # callers can't interleave their disk writes and leave the
-                # marker disagreeing with the on-disk store.
+            def _mutate() -> int:
                 with self._marker_lock:
                     try:
                         self.store.add(**add_kwargs)
@@ -490,16 +520,36 @@ class SemanticRouter:
                         self.store.save()
                         self.store.add(**add_kwargs)
                     self.store.trim(ROUTER_CACHE_MAX_SIZE)
-                    self.store.save()
-                    # Keep the marker in sync with cache contents so the
-                    # next startup can detect drift without loading the
-                    # embedder.
-                    self._write_marker(EMBEDDING_MODEL, self.store.dim())
+                    self._dirty_gen += 1
+                    return self._dirty_gen
 
-            await loop.run_in_executor(None, _mutate_and_save)
+            gen = await loop.run_in_executor(RETRIEVAL_EXECUTOR, _mutate)
+            await loop.run_in_executor(RETRIEVAL_EXECUTOR, self._flush_cache, gen)
         except Exception as e:
             logger.error("Failed to update cache: %s", e, exc_info=True)
 
+    def _flush_cache(self, gen: int) -> None:
+        """Persist the cache if mutation ``gen`` is not on disk yet.
+
+        Flushers are serialized; while one saves, later writers queue up and
+        the first of them saves all of their entries at once — the rest find
+        their gen already covered and return without touching disk.
+        """
+        with self._flush_lock:
+            if self._saved_gen >= gen:
+                return
+            # Hold the router-level lock for the whole (store + marker)
+            # sequence so concurrent update_cache / _wipe_and_remark callers
+            # can't interleave their disk writes and leave the marker
+            # disagreeing with the on-disk store.
+            with self._marker_lock:
+                target = self._dirty_gen
+                self.store.save()
+                # Keep the marker in sync with cache contents so the next
+                # startup can detect drift without loading the embedder.
+                self._write_marker(EMBEDDING_MODEL, self.store.dim())
+            self._saved_gen = target
+
     @observe(name="route_request")
     async def route(self, request: AgentRequest) -> Optional[RouterDecision]:
         """
@@ -23,6 +23,10 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
 
 from src.engine.config import RULES_DIR, RULES_ENABLED
 from src.utils.prompt_loader import split_frontmatter
@@ -72,7 +76,7 @@ def _parse_rule_file(path: str) -> Optional[Rule]:
         return None
 
     try:
-        fm = yaml.safe_load(fm_str) or {}
+        fm = yaml.load(fm_str, Loader=SafeLoader) or {}
     except yaml.YAMLError as e:
         logger.error("Bad frontmatter YAML in %s: %s", path, e)
         return None
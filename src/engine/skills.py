@@ -3,14 +3,15 @@ import os
 import glob
 import hashlib
 import re
-import yaml
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from src.utils.langfuse_compat import observe
-from typing import List, Dict, Any
-from src.utils.prompt_loader import split_frontmatter
+from typing import List, Dict, Any, Optional
 
-from src.engine.config import SKILLS_DIR, SKILLS_RELEVANCE_THRESHOLD, DATA_DIR
+from src.engine._indexing import parse_mdc_file, replace_index
+from src.engine.config import SKILLS_DIR, SKILLS_RELEVANCE_THRESHOLD, INSTALL_DATA_DIR, EMBEDDING_MODEL
 from src.engine.vector_store import NumpyVectorStore
-from src.engine.embedder import embed_texts, embed_query
+from src.engine.embedder import embed_query
 
 logger = logging.getLogger(__name__)
 
@@ -28,10 +29,13 @@ def _normalize_keywords(raw: Any) -> List[str]:
 
 
 class SkillRetriever:
-    HASH_FILE = os.path.join(DATA_DIR, ".skills_hash")
+    HASH_FILE = os.path.join(INSTALL_DATA_DIR, ".skills_hash")
+    # Per-file content digests of the last index, so a reindex only embeds
+    # skills that actually changed and reuses stored vectors for the rest.
+    MANIFEST_FILE = os.path.join(INSTALL_DATA_DIR, ".skills_manifest.json")
 
     def __init__(self):
-        self.store = NumpyVectorStore(name="skills_store", data_dir=DATA_DIR)
+        self.store = NumpyVectorStore(name="skills_store", data_dir=INSTALL_DATA_DIR, storage_dtype=np.float16)
 
         changed, self._current_hash = self._needs_reindex()
         # Also reindex if store is empty but .mdc files exist (corrupted/missing store)
@@ -45,7 +49,6 @@ class SkillRetriever:
 
     @staticmethod
     def _compute_dir_hash() -> str:
-        from src.engine.config import EMBEDDING_MODEL
         h = hashlib.md5()
         h.update(EMBEDDING_MODEL.encode())
         for path in sorted(glob.glob(os.path.join(SKILLS_DIR, "*.mdc"))):
@@ -69,83 +72,58 @@ class SkillRetriever:
         with open(self.HASH_FILE, "w") as f:
             f.write(digest or self._compute_dir_hash())
 
+    @staticmethod
+    def _read_and_parse(file_path: str) -> Optional[tuple[str, str, str, Dict[str, Any]]]:
+        """Read one skill file and return (filename, sha256, full_text, metadata),
+        or None if it can't be read. Runs on a worker thread."""
+        try:
+            digest, frontmatter, body = parse_mdc_file(file_path)
+
+            # Prepare for indexing — concat description + keywords + body
+            # so keywords contribute to the embedding similarity, alongside
+            # being available verbatim in metadata for keyword-bonus scoring.
+            description = frontmatter.get("description", "")
+            compiled = frontmatter.get("compiled", "")
+            keywords = _normalize_keywords(frontmatter.get("keywords"))
+            filename = os.path.basename(file_path)
+            full_text = f"{description}\n{' '.join(keywords)}\n\n{body}"
+
+            return filename, digest, full_text, {
+                "filename": filename,
+                "description": description,
+                "path": file_path,
+                "body": body,
+                "compiled": compiled,
+                "keywords": keywords,
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing skill file {file_path}: {e}")
+            return None
+
     def index_skills(self):
         """
         Reads all .mdc files in SKILLS_DIR and indexes them.
+        Only files whose content changed since the last index are re-embedded.
         """
         skill_files = glob.glob(os.path.join(SKILLS_DIR, "*.mdc"))
 
         if not skill_files:
             logger.warning(f"No skill files found in {SKILLS_DIR}")
-            self.store.clear()
-            self.store.save()
+            replace_index(self.store, [], self.MANIFEST_FILE, "skill")
             self._save_hash(getattr(self, "_current_hash", None))
             return
 
-        documents = []
-        metadatas = []
-        ids = []
-
-        for file_path in skill_files:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Parse frontmatter
-                frontmatter = {}
-                body = content
-
-                fm_str, parsed_body = split_frontmatter(content)
-                if fm_str is not None:
-                    try:
-                        frontmatter = yaml.safe_load(fm_str) or {}
-                        body = parsed_body
-                    except Exception as e:
-                        logger.error(f"Failed to parse frontmatter for {file_path}: {e}")
-
-                # Prepare for indexing — concat description + keywords + body
-                # so keywords contribute to the embedding similarity, alongside
-                # being available verbatim in metadata for keyword-bonus scoring.
-                description = frontmatter.get("description", "")
-                compiled = frontmatter.get("compiled", "")
-                keywords = _normalize_keywords(frontmatter.get("keywords"))
-                filename = os.path.basename(file_path)
-                full_text = f"{description}\n{' '.join(keywords)}\n\n{body}"
-
-                documents.append(full_text)
-                metadatas.append({
-                    "filename": filename,
-                    "description": description,
-                    "path": file_path,
-                    "body": body,
-                    "compiled": compiled,
-                    "keywords": keywords,
-                })
-                ids.append(filename)
-
-                logger.info(f"Indexed skill: {filename}")
-
-            except Exception as e:
-                logger.error(f"Error processing skill file {file_path}: {e}")
+        with ThreadPoolExecutor(max_workers=min(8, len(skill_files))) as ex:
+            parsed = list(ex.map(self._read_and_parse, skill_files))
 
-        if not documents:
-            # All files failed to parse — clear stale store
-            self.store.clear()
-            self.store.save()
-            self._save_hash(getattr(self, "_current_hash", None))
-            logger.warning("No skills could be parsed — store cleared")
-            return
-
-        embeddings = embed_texts(documents)
-        self.store.replace(
-            ids=ids,
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadatas,
-        )
-        self.store.save()
+        count = replace_index(self.store, parsed, self.MANIFEST_FILE, "skill")
         self._save_hash(getattr(self, "_current_hash", None))
-        logger.info(f"Successfully indexed {len(documents)} skills.")
+        if count:
+            logger.info(f"Successfully indexed {count} skills.")
+        else:
+            # All files failed to parse — stale store was cleared
+            logger.warning("No skills could be parsed — store cleared")
 
     @staticmethod
     def _to_id(name: str) -> str:
@@ -237,15 +215,15 @@ class SkillRetriever:
 
         query_emb = embed_query(query)
         query_lower = query.lower()
-        # Query a wide window then filter to pool — store may have more skills.
-        results = self.store.query(query_embedding=query_emb, n_results=self.store.count())
+        # Score only the agent's pool — the store holds every skill.
+        results = self.store.query(
+            query_embedding=query_emb, n_results=len(pool_ids), ids=pool_ids
+        )
         if not results.ids or not results.distances:
             return skills
 
         scored: list[tuple[float, str, dict, str]] = []
         for i, sid in enumerate(results.ids):
-            if sid not in pool_ids:
-                continue
             d = results.distances[i]
             meta = results.metadatas[i] or {}
             tier_label = "preferred" if sid in preferred_ids else "capable"
@@ -11,15 +11,33 @@ import os
 import tempfile
 import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Collection, Dict, List, Optional
 
 import numpy as np
 
+try:
+    import orjson  # Optional: faster metadata (de)serialization
+except ImportError:
+    orjson = None
+
+from src.engine.config import RETRIEVAL_POOL_SIZE
+
 logger = logging.getLogger(__name__)
 
+# Shared pool for async callers offloading embedding + store work
+# (router, enrichment, load_implants). Threads start lazily on first use.
+RETRIEVAL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=RETRIEVAL_POOL_SIZE, thread_name_prefix="retrieval"
+)
+
 _EPS = np.float32(1e-10)
 
+# Above this many entries, top-n is selected with argpartition (O(N)) and
+# only the n winners are sorted; below it a full argsort is cheaper.
+_PARTIAL_SORT_MIN_SIZE = 512
+
 
 @dataclass
 class QueryResult:
@@ -37,11 +55,18 @@ class GetResult:
 
 
 class NumpyVectorStore:
-    """Thread-safe in-memory vector store backed by .npz + .json files."""
+    """Thread-safe in-memory vector store backed by .npz + .json files.
+
+    ``storage_dtype`` only affects the on-disk .npz: stores of normalized
+    sentence embeddings can persist as float16 (half the file size and load
+    I/O, ~1e-3 cosine error). Vectors are always upcast to float32 in memory
+    since numpy's BLAS path is far faster there than on int8/float16.
+    """
 
-    def __init__(self, name: str, data_dir: str):
+    def __init__(self, name: str, data_dir: str, storage_dtype: np.dtype = np.float32):
         self.name = name
         self._data_dir = data_dir
+        self._storage_dtype = np.dtype(storage_dtype)
         self._npz_path = os.path.join(data_dir, f"{name}.npz")
         self._meta_path = os.path.join(data_dir, f"{name}.json")
         self._lock = threading.RLock()
@@ -64,8 +89,9 @@ class NumpyVectorStore:
                     self._embeddings = data["embeddings"].astype(np.float32, copy=False)
                     npz_version = str(data["save_version"]) if "save_version" in data.files else ""
 
-                with open(self._meta_path, "r", encoding="utf-8") as f:
-                    meta = json.load(f)
+                with open(self._meta_path, "rb") as f:
+                    raw = f.read()
+                meta = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
                 self._ids = meta["ids"]
                 self._documents = meta["documents"]
@@ -143,11 +169,14 @@ class NumpyVectorStore:
         self._metadatas = []
         self._id_to_idx = {}
 
+    @staticmethod
+    def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+        return embeddings / (np.linalg.norm(embeddings, axis=1, keepdims=True) + _EPS)
+
     def _recompute_norms(self):
         """Precompute L2-normalized embeddings for fast cosine queries."""
         if self._embeddings is not None and len(self._ids) > 0:
-            norms = np.linalg.norm(self._embeddings, axis=1, keepdims=True) + _EPS
-            self._normed = self._embeddings / norms
+            self._normed = self._normalize_rows(self._embeddings)
         else:
             self._normed = None
 
@@ -173,7 +202,8 @@ class NumpyVectorStore:
                 )
                 os.close(fd)
                 try:
-                    np.savez(tmp_npz_path, embeddings=self._embeddings,
+                    np.savez(tmp_npz_path,
+                             embeddings=self._embeddings.astype(self._storage_dtype, copy=False),
                              save_version=np.array(version))
                     os.replace(tmp_npz_path, self._npz_path)
                 except Exception:
@@ -203,8 +233,12 @@ class NumpyVectorStore:
             )
             os.close(fd)
             try:
-                with open(tmp_meta_path, "w", encoding="utf-8") as f:
-                    json.dump(meta, f, ensure_ascii=False)
+                if orjson is not None:
+                    payload = orjson.dumps(meta)
+                else:
+                    payload = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+                with open(tmp_meta_path, "wb") as f:
+                    f.write(payload)
                 os.replace(tmp_meta_path, self._meta_path)
             except Exception:
                 if os.path.exists(tmp_meta_path):
@@ -307,9 +341,11 @@ class NumpyVectorStore:
                 return
 
             new_emb_array = np.asarray(new_embs, dtype=np.float32)
+            new_normed = self._normalize_rows(new_emb_array)
 
             if self._embeddings is None or len(self._ids) == 0:
                 self._embeddings = new_emb_array
+                self._normed = new_normed
             else:
                 if new_emb_array.shape[1] != self._embeddings.shape[1]:
                     raise ValueError(
@@ -318,6 +354,10 @@ class NumpyVectorStore:
                         f"{self._embeddings.shape[1]} dims"
                     )
                 self._embeddings = np.vstack([self._embeddings, new_emb_array])
+                # Only the appended rows need normalizing; the router cache
+                # adds one entry per routing decision.
+                if self._normed is not None:
+                    self._normed = np.vstack([self._normed, new_normed])
 
             base_idx = len(self._ids)
             self._ids.extend(new_ids)
@@ -325,14 +365,20 @@ class NumpyVectorStore:
             self._metadatas.extend(new_metas)
             for i, id_ in enumerate(new_ids):
                 self._id_to_idx[id_] = base_idx + i
-            self._recompute_norms()
+            if self._normed is None:
+                self._recompute_norms()
 
     def query(
         self,
         query_embedding: np.ndarray,
         n_results: int = 1,
+        ids: Optional[Collection[str]] = None,
     ) -> QueryResult:
-        """Cosine similarity search. Returns closest n_results."""
+        """Cosine similarity search. Returns closest n_results.
+
+        ``ids`` restricts the search to those entries (unknown IDs are
+        ignored), so only the candidate rows are scored.
+        """
         with self._lock:
             if self._embeddings is None or len(self._ids) == 0:
                 return QueryResult(ids=[], distances=[], documents=[], metadatas=[])
@@ -354,18 +400,32 @@ class NumpyVectorStore:
             query_norm = query_vec / (np.linalg.norm(query_vec) + _EPS)
             if self._normed is None:
                 self._recompute_norms()
-            similarities = self._normed @ query_norm
-            distances = np.float32(1.0) - similarities
+            if ids is not None:
+                rows = np.fromiter(
+                    sorted(self._id_to_idx[id_] for id_ in ids if id_ in self._id_to_idx),
+                    dtype=np.intp,
+                )
+                distances = np.float32(1.0) - self._normed[rows] @ query_norm
+            else:
+                rows = None
+                distances = np.float32(1.0) - self._normed @ query_norm
 
-            # Get top-n indices (use argsort for correctness at small N)
-            n = min(n_results, len(self._ids))
+            # Get top-n indices: full argsort at small N, partial selection
+            # once the store is large enough for the O(N log N) sort to matter.
+            n = min(n_results, len(distances))
             if n <= 0:
                 return QueryResult(ids=[], distances=[], documents=[], metadatas=[])
-            top_indices = np.argsort(distances)[:n]
+            if len(distances) >= _PARTIAL_SORT_MIN_SIZE and n < len(distances):
+                top = np.argpartition(distances, n - 1)[:n]
+                top = top[np.argsort(distances[top])]
+            else:
+                top = np.argsort(distances)[:n]
+            top_distances = distances[top]
+            top_indices = rows[top] if rows is not None else top
 
             return QueryResult(
                 ids=[self._ids[i] for i in top_indices],
-                distances=[float(distances[i]) for i in top_indices],
+                distances=[float(d) for d in top_distances],
                 documents=[self._documents[i] for i in top_indices],
                 metadatas=[self._metadatas[i] for i in top_indices],
             )
@@ -386,6 +446,21 @@ class NumpyVectorStore:
 
             return GetResult(ids=found_ids, documents=found_docs, metadatas=found_metas)
 
+    def get_embeddings(self, ids: List[str]) -> Dict[str, np.ndarray]:
+        """Return stored raw embeddings for the found IDs (copies, keyed by ID).
+
+        Lets indexers reuse vectors for unchanged documents instead of
+        re-embedding them.
+        """
+        with self._lock:
+            if self._embeddings is None:
+                return {}
+            return {
+                id_: self._embeddings[self._id_to_idx[id_]].copy()
+                for id_ in ids
+                if id_ in self._id_to_idx
+            }
+
     def trim(self, max_size: int):
         """Keep only the most recent max_size entries (by insertion order)."""
         with self._lock:
@@ -397,7 +472,10 @@ class NumpyVectorStore:
             self._documents = self._documents[keep_from:]
             self._metadatas = self._metadatas[keep_from:]
             self._id_to_idx = {id_: i for i, id_ in enumerate(self._ids)}
-            self._recompute_norms()
+            if self._normed is not None:
+                self._normed = self._normed[keep_from:]
+            else:
+                self._recompute_norms()
             logger.debug("[%s] Trimmed to %d entries", self.name, max_size)
 
     def get_all_metadatas(self) -> List[Dict[str, Any]]:
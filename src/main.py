@@ -1,7 +1,8 @@
 import uuid
 import dotenv
 import asyncio
-from typing import List, Optional
+import contextvars
+from typing import Any, Callable, List, Optional
 from src.utils.langfuse_compat import observe, get_langfuse
 
 from src.schemas.protocol import AgentRequest, AgentResponse
@@ -9,12 +10,19 @@ from src.engine.router import SemanticRouter
 from src.utils.prompt_loader import load_agent_prompt
 from src.engine.implants import ImplantRetriever
 from src.engine.context import ContextRetriever
+from src.engine.vector_store import RETRIEVAL_EXECUTOR
 
 # Load environment variables
 dotenv.load_dotenv()
 
 langfuse = get_langfuse()
 
+
+def _run_in_pool(fn: Callable[[], Any]) -> "asyncio.Future[Any]":
+    """Run a blocking call on the retrieval pool, keeping contextvars (Langfuse trace nesting)."""
+    ctx = contextvars.copy_context()
+    return asyncio.get_running_loop().run_in_executor(RETRIEVAL_EXECUTOR, ctx.run, fn)
+
 class AgentSystem:
     def __init__(self):
         self.router = SemanticRouter()
@@ -40,22 +48,24 @@ class AgentSystem:
         # 2. Route (Langfuse Step 2 - Uses Context)
         decision = await self.router.route(request)
 
-        # 3. Load Agent Prompt
-        try:
-            system_prompt = load_agent_prompt(decision.target_agent)
-        except Exception as e:
-            # Fallback
-            system_prompt = "You are a helpful assistant."
+        # 3 + 4. Load Agent Prompt and Relevant Implants (Langfuse Step 3 - Uses Context + Role).
+        # Both depend only on the routing decision, so run them concurrently.
+        def _load_prompt() -> str:
+            try:
+                return load_agent_prompt(decision.target_agent)
+            except Exception:
+                # Fallback
+                return "You are a helpful assistant."
 
-        # 4. Load Relevant Implants (Langfuse Step 3 - Uses Context + Role)
-        loop = asyncio.get_running_loop()
-        implants = await loop.run_in_executor(
-            None,
-            lambda: self.implant_retriever.retrieve(
-                user_query,
-                n_results=3,
-                context=ctx,
-                role=decision.target_agent,
+        system_prompt, implants = await asyncio.gather(
+            _run_in_pool(_load_prompt),
+            _run_in_pool(
+                lambda: self.implant_retriever.retrieve(
+                    user_query,
+                    n_results=3,
+                    context=ctx,
+                    role=decision.target_agent,
+                ),
             ),
         )
         formatted_implants = self.implant_retriever.format_implants_for_prompt(implants)
@@ -8,6 +8,9 @@ Dependencies:
 - pdf2image (requires poppler-utils system package)
 - Pillow
 - anthropic (for Claude Vision)
+- opencv-python-headless (optional, faster image preprocessing)
+- PyTurboJPEG + libjpeg-turbo (optional, faster JPEG encoding)
+- PyMuPDF (optional, in-process PDF rendering instead of poppler; AGPL-licensed)
 
 System Requirements:
 - Linux: sudo apt-get install poppler-utils
@@ -17,22 +20,113 @@ System Requirements:
 
 import os
 import io
+import asyncio
+import time
 import base64
+import functools
+import hashlib
 import logging
+import random
+import shutil
+import sqlite3
+import threading
 from pathlib import Path
 from typing import Optional, Literal
 
-from mcp.server.fastmcp import FastMCP
+import numpy as np
+from mcp.server.fastmcp import Context, FastMCP
 from dotenv import load_dotenv
 
+# Imported once at startup; missing packages are reported by check_dependencies.
+try:
+    from PIL import Image, ImageEnhance
+except ImportError:
+    Image = ImageEnhance = None
+
+try:
+    from pdf2image import convert_from_path
+    from pdf2image.pdf2image import pdfinfo_from_path
+except ImportError:
+    convert_from_path = pdfinfo_from_path = None
+
+try:
+    import anthropic
+    import httpx
+except ImportError:  # reported by check_dependencies
+    anthropic = None
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+try:
+    import pymupdf as fitz  # Optional: PyMuPDF renders PDFs in-process (no pdftoppm subprocess)
+except ImportError:
+    try:
+        import fitz  # PyMuPDF < 1.24 only ships the legacy module name
+    except ImportError:
+        fitz = None
+
+try:
+    import cv2  # Optional: SIMD resize/enhance in preprocess_image
+except ImportError:
+    cv2 = None
+
+try:
+    # Optional: libjpeg-turbo SIMD encoder for image_to_base64. The constructor
+    # loads the shared library and fails if it is not installed system-wide.
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJPF_GRAY, TJSAMP_420, TJSAMP_GRAY
+    _turbojpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbojpeg = None
+
 # Load environment variables
 load_dotenv()
 
 # Configuration
 SERVER_NAME = "document-ocr"
 VISION_PROVIDER = "anthropic"
+VISION_MODEL = "claude-sonnet-4-20250514"
 MAX_IMAGE_SIZE = 20 * 1024 * 1024  # 20MB max for Vision API
 
+# Long edge sent to the Vision API. Claude downsamples anything larger
+# anyway, so bigger images only cost upload time. JPEG quality 85 is
+# visually lossless for text and several times smaller than 95.
+MAX_IMAGE_DIMENSION = 2000
+JPEG_QUALITY = 85
+
+# OCR results keyed by (model, prompt, encoded image). Repeated pages, form
+# templates and retries skip the Vision API round-trip. Empty path disables.
+OCR_CACHE_PATH = os.path.expanduser(
+    os.getenv("OCR_CACHE_PATH", "~/.cache/document-ocr/ocr_cache.sqlite3")
+)
+OCR_CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+# Max pages of one PDF in flight at once (preprocess + Vision API call).
+try:
+    OCR_CONCURRENCY = max(1, int(os.getenv("OCR_CONCURRENCY", "8")))
+except ValueError:
+    OCR_CONCURRENCY = 8
+
+# Vision API request rate shared by all concurrent pages (requests/second,
+# 0 disables), and attempts per call when the API answers 429/overloaded.
+try:
+    VISION_RPS = max(0.0, float(os.getenv("VISION_RPS", "4")))
+except ValueError:
+    VISION_RPS = 4.0
+VISION_MAX_ATTEMPTS = 4
+VISION_MAX_BACKOFF = 60.0
+
+# Threads preprocessing + JPEG-encoding rendered pages while earlier pages
+# wait on the Vision API.
+PREPROCESS_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# Pages rendered per poppler call. Rendering is streamed window by window so
+# only a few full-resolution bitmaps are alive at a time on large PDFs.
+PDF_RENDER_CHUNK = 4
+
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(SERVER_NAME)
@@ -44,14 +138,66 @@ mcp = FastMCP(SERVER_NAME)
 # Utility Functions
 # ============================================================================
 
-def image_to_base64(image) -> str:
-    """Convert PIL Image to base64 string."""
+def encode_jpeg(image, quality: int = JPEG_QUALITY) -> bytes | memoryview:
+    """Encode a PIL Image or uint8 array (H×W gray / H×W×3 RGB) as JPEG,
+    using libjpeg-turbo when available.
+
+    Returns a bytes-like object: on the Pillow path it is a view of the
+    encoder's buffer rather than a copy of it.
+    """
+    if isinstance(image, np.ndarray):
+        if _turbojpeg is None:
+            image = Image.fromarray(image)
+        else:
+            arr = image
+    else:
+        # Convert to RGB if necessary (for PNG with alpha channel)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        arr = np.asarray(image) if _turbojpeg is not None else None
+
+    if _turbojpeg is not None:
+        if arr.ndim == 2:
+            return _turbojpeg.encode(arr[:, :, None], quality=quality,
+                                     pixel_format=TJPF_GRAY, jpeg_subsample=TJSAMP_GRAY)
+        return _turbojpeg.encode(arr, quality=quality,
+                                 pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+
     buffer = io.BytesIO()
-    # Convert to RGB if necessary (for PNG with alpha channel)
-    if image.mode in ('RGBA', 'LA', 'P'):
-        image = image.convert('RGB')
-    image.save(buffer, format='JPEG', quality=95)
-    return base64.b64encode(buffer.getvalue()).decode('utf-8')
+    image.save(buffer, format='JPEG', quality=quality, optimize=True)
+    return buffer.getbuffer()
+
+def image_to_base64(image) -> str:
+    """Convert PIL Image (or preprocessed array) to base64 JPEG string."""
+    return base64.b64encode(encode_jpeg(image)).decode('ascii')
+
+def _preprocess_cv2(image, new_size, enhance: bool):
+    """OpenCV (SIMD) equivalent of the Pillow resize + sharpness + contrast passes.
+
+    Returns a uint8 array; encode_jpeg takes it as-is, so the pixels are not
+    copied back into a PIL image.
+    """
+    arr = np.asarray(image)
+    if new_size is not None:
+        # Downscale only (see preprocess_image); INTER_AREA is the fast,
+        # alias-free kernel for shrinking.
+        arr = cv2.resize(arr, new_size, interpolation=cv2.INTER_AREA)
+
+    if enhance:
+        # Sharpness 1.5 == 1.5 * img - 0.5 * smoothed, with PIL's SMOOTH
+        # kernel so the result matches ImageEnhance.Sharpness
+        smooth = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], dtype=np.float32) / 13
+        blurred = cv2.filter2D(arr, -1, smooth, borderType=cv2.BORDER_REPLICATE)
+        if not arr.flags.writeable:
+            arr = arr.copy()
+        cv2.addWeighted(arr, 1.5, blurred, -0.5, 0, dst=arr)
+        # Contrast 1.2 around the grayscale mean, as ImageEnhance.Contrast does
+        gray = arr if arr.ndim == 2 else cv2.cvtColor(arr, cv2.COLOR_RGB2GRAY)
+        mean = float(gray.mean())
+        # (addWeighted saturates to 0..255; convertScaleAbs would mirror negatives)
+        cv2.addWeighted(arr, 1.2, arr, 0.0, -0.2 * mean, dst=arr)
+
+    return arr
 
 def preprocess_image(image, enhance: bool = True):
     """
@@ -60,14 +206,29 @@ def preprocess_image(image, enhance: bool = True):
     - Convert to grayscale for text
     - Enhance contrast
     - Resize if too large
+
+    Uses OpenCV's vectorized kernels when installed (optional), falling back
+    to Pillow otherwise. The OpenCV path returns a uint8 array instead of a
+    PIL Image; ``image_to_base64`` accepts either.
     """
-    from PIL import Image, ImageEnhance
+    # Palette/alpha/CMYK images are converted once here rather than at encode
+    # time, so every later pass (and the OpenCV path) sees L or RGB.
+    if image.mode not in ("L", "RGB"):
+        image = image.convert("RGB")
 
     # Resize if too large (Vision APIs have limits)
-    max_dimension = 4096
-    if max(image.size) > max_dimension:
-        ratio = max_dimension / max(image.size)
+    new_size = None
+    if max(image.size) > MAX_IMAGE_DIMENSION:
+        ratio = MAX_IMAGE_DIMENSION / max(image.size)
         new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
+
+    if cv2 is not None:
+        arr = _preprocess_cv2(image, new_size, enhance)
+        if new_size is not None:
+            logger.info(f"Resized image to {new_size}")
+        return arr
+
+    if new_size is not None:
         image = image.resize(new_size, Image.Resampling.LANCZOS)
         logger.info(f"Resized image to {new_size}")
 
@@ -82,6 +243,107 @@ def preprocess_image(image, enhance: bool = True):
 
     return image
 
+class _OcrCache:
+    """SQLite-backed ``key -> extracted text`` store with a TTL.
+
+    Best-effort: any SQLite/OS error is logged and the cache degrades to a
+    no-op, so OCR never fails because of it.
+    """
+
+    _PRUNE_EVERY = 64
+
+    def __init__(self, path: str, ttl: int):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_results "
+                "(key TEXT PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._conn = conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("OCR cache unavailable at %s: %s", path, e)
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def get(self, key: str) -> Optional[str]:
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT text FROM ocr_results WHERE key = ? AND created > ?",
+                    (key, time.time() - self._ttl),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("OCR cache read failed: %s", e)
+            return None
+        return row[0] if row else None
+
+    def set(self, key: str, text: str) -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                now = time.time()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ocr_results (key, text, created) VALUES (?, ?, ?)",
+                    (key, text, now),
+                )
+                self._writes += 1
+                if self._writes % self._PRUNE_EVERY == 0:
+                    self._conn.execute(
+                        "DELETE FROM ocr_results WHERE created <= ?", (now - self._ttl,)
+                    )
+        except sqlite3.Error as e:
+            logger.debug("OCR cache write failed: %s", e)
+
+
+_ocr_cache: Optional[_OcrCache] = None
+
+def _get_ocr_cache() -> _OcrCache:
+    global _ocr_cache
+    if _ocr_cache is None:
+        _ocr_cache = _OcrCache(OCR_CACHE_PATH, OCR_CACHE_TTL_SECONDS)
+    return _ocr_cache
+
+def _ocr_cache_key(provider: str, prompt: str, image_base64: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in (provider, VISION_MODEL, prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    h.update(image_base64.encode("ascii"))
+    return h.hexdigest()
+
+def _file_digest(path) -> str:
+    """blake2b of a file's bytes, read in 1 MiB blocks."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _source_cache_key(file_digest: str, *params) -> str:
+    """Key for OCR of a source file (or one PDF page of it) *before* decoding.
+
+    Hits skip rendering, preprocessing and encoding as well as the API call.
+    Pipeline settings are part of the key so changing them re-OCRs.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in (VISION_PROVIDER, VISION_MODEL, MAX_IMAGE_DIMENSION, JPEG_QUALITY,
+                 file_digest, *params):
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return "src:" + h.hexdigest()
+
 async def call_vision_api(
     image_base64: str,
     prompt: str,
@@ -89,24 +351,126 @@ async def call_vision_api(
 ) -> str:
     """
     Call Vision API (Claude Vision) to extract text from image.
+
+    Results are cached by content hash of the encoded image and prompt.
     """
-    if provider == "anthropic":
-        return await _call_anthropic_vision(image_base64, prompt)
-    else:
+    if provider != "anthropic":
         raise ValueError(f"Unknown vision provider: {provider}")
 
+    cache = _get_ocr_cache()
+    key = _ocr_cache_key(provider, prompt, image_base64)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info("OCR cache hit")
+        return cached
+
+    text = await _call_anthropic_vision(image_base64, prompt)
+    cache.set(key, text)
+    return text
+
+# Shared client so PDF pages reuse pooled keep-alive connections instead of
+# paying a TLS handshake per call. Rebuilt only if the API key changes.
+_anthropic_client = None
+_anthropic_client_key: Optional[str] = None
+
+class AsyncTokenBucket:
+    """Spaces acquisitions at least ``1 / rps`` seconds apart."""
+
+    def __init__(self, rps: float):
+        self.min_interval = 1.0 / rps
+        self._lock = asyncio.Lock()
+        self._next = 0.0
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            wait = max(0.0, self._next - now)
+            self._next = max(now, self._next) + self.min_interval
+        if wait:
+            await asyncio.sleep(wait)
+
+_vision_bucket = AsyncTokenBucket(VISION_RPS) if VISION_RPS > 0 else None
+
+def _is_retryable(exc: Exception) -> bool:
+    """429 rate limits, 529 overloaded / 5xx, and dropped connections."""
+    if anthropic is None:
+        return False
+    return isinstance(exc, (
+        anthropic.RateLimitError,
+        anthropic.InternalServerError,
+        anthropic.APIConnectionError,
+    ))
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds from the response's Retry-After header, if present and numeric."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def rate_limited(func):
+    """Throttle calls through the shared token bucket and retry transient
+    API errors with exponential backoff, honoring Retry-After."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        for attempt in range(VISION_MAX_ATTEMPTS):
+            if _vision_bucket is not None:
+                await _vision_bucket.acquire()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                if attempt == VISION_MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                    raise
+                delay = _retry_after(e) or 2 ** attempt
+                delay = min(VISION_MAX_BACKOFF, delay) * random.uniform(1.0, 1.25)
+                logger.warning(
+                    f"Vision API {type(e).__name__}, retry {attempt + 1}/"
+                    f"{VISION_MAX_ATTEMPTS - 1} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+    return wrapper
+
+def _get_anthropic_client(api_key: str):
+    """Return the process-wide AsyncAnthropic client for this API key."""
+    global _anthropic_client, _anthropic_client_key
+    if _anthropic_client is None or _anthropic_client_key != api_key:
+        if anthropic is None:
+            raise ImportError("anthropic is not installed (pip install anthropic)")
+        _anthropic_client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            # Retries are handled by @rate_limited so they go through the
+            # shared token bucket instead of multiplying with the SDK's own.
+            max_retries=0,
+            # Fail fast on connect; generation itself may legitimately be slow
+            timeout=httpx.Timeout(600.0, connect=5.0),
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                http2=_HTTP2,
+                # httpx drops idle connections after 5s by default, which is
+                # shorter than the gap between tool calls; keep them for 60s.
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=60.0,
+                ),
+            ),
+        )
+        _anthropic_client_key = api_key
+    return _anthropic_client
+
+@rate_limited
 async def _call_anthropic_vision(image_base64: str, prompt: str) -> str:
     """Call Claude Vision API."""
-    import anthropic
-
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY environment variable not set")
 
-    client = anthropic.AsyncAnthropic(api_key=api_key)
+    client = _get_anthropic_client(api_key)
 
     message = await client.messages.create(
-        model="claude-sonnet-4-20250514",
+        model=VISION_MODEL,
         max_tokens=4096,
         messages=[
             {
@@ -131,6 +495,53 @@ async def _call_anthropic_vision(image_base64: str, prompt: str) -> str:
 
     return message.content[0].text
 
+def _page_windows(page_nums: list[int], chunk: int) -> list[tuple[int, int]]:
+    """Split page numbers (in request order) into consecutive (first, last)
+    windows of at most *chunk* pages."""
+    windows: list[tuple[int, int]] = []
+    for num in page_nums:
+        if windows and num == windows[-1][1] + 1 and num - windows[-1][0] < chunk:
+            windows[-1] = (windows[-1][0], num)
+        else:
+            windows.append((num, num))
+    return windows
+
+def _require_pdf2image() -> None:
+    if convert_from_path is None:
+        raise ImportError("pdf2image is not installed (pip install pdf2image)")
+
+def _pdf_page_count(path) -> int:
+    """Number of pages in the PDF (PyMuPDF if installed, else poppler's pdfinfo)."""
+    if fitz is not None:
+        with fitz.open(str(path)) as doc:
+            return doc.page_count
+    _require_pdf2image()
+    return int(pdfinfo_from_path(path)["Pages"])
+
+def _iter_page_images(path, dpi: int, page_nums: list[int], chunk: int = PDF_RENDER_CHUNK):
+    """Yield (page_num, PIL image) rendering at most *chunk* pages at a time.
+
+    With PyMuPDF, pages are rasterized in-process one at a time; otherwise
+    pdf2image shells out to pdftoppm once per window of *chunk* pages.
+    """
+    if fitz is not None:
+        matrix = fitz.Matrix(dpi / 72, dpi / 72)
+        with fitz.open(str(path)) as doc:
+            for num in page_nums:
+                pix = doc.load_page(num - 1).get_pixmap(matrix=matrix, alpha=False)
+                image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+                del pix
+                yield num, image
+        return
+
+    _require_pdf2image()
+
+    for first, last in _page_windows(page_nums, chunk):
+        images = convert_from_path(path, dpi=dpi, first_page=first, last_page=last)
+        for offset, image in enumerate(images):
+            yield first + offset, image
+        del images
+
 # ============================================================================
 # OCR Prompts
 # ============================================================================
@@ -177,6 +588,12 @@ SPECIAL INSTRUCTIONS for handwriting:
 
 OUTPUT: Return the extracted text in Markdown format."""
 
+OCR_PROMPTS = {
+    "standard": OCR_PROMPT_STANDARD,
+    "compact": OCR_PROMPT_COMPACT,
+    "handwriting": OCR_PROMPT_HANDWRITING,
+}
+
 # ============================================================================
 # MCP Tools
 # ============================================================================
@@ -198,8 +615,6 @@ async def extract_text_from_image(
     Returns:
         Extracted text in Markdown format
     """
-    from PIL import Image
-
     path = Path(image_path).expanduser().resolve()
 
     if not path.exists():
@@ -209,6 +624,19 @@ async def extract_text_from_image(
         return f"Error: Unsupported image format: {path.suffix}"
 
     try:
+        prompt = OCR_PROMPTS.get(mode, OCR_PROMPT_STANDARD)
+
+        # Same file bytes + prompt + settings: answer without decoding
+        cache = _get_ocr_cache()
+        source_key = None
+        if cache.enabled:
+            digest = await asyncio.get_running_loop().run_in_executor(None, _file_digest, path)
+            source_key = _source_cache_key(digest, "image", enhance, prompt)
+            cached = cache.get(source_key)
+            if cached is not None:
+                logger.info(f"OCR cache hit: {path}")
+                return cached
+
         # Load and preprocess image
         image = Image.open(path)
         logger.info(f"Loaded image: {path}, size: {image.size}, mode: {image.mode}")
@@ -219,16 +647,10 @@ async def extract_text_from_image(
         # Convert to base64
         image_b64 = image_to_base64(image)
 
-        # Select prompt
-        prompts = {
-            "standard": OCR_PROMPT_STANDARD,
-            "compact": OCR_PROMPT_COMPACT,
-            "handwriting": OCR_PROMPT_HANDWRITING
-        }
-        prompt = prompts.get(mode, OCR_PROMPT_STANDARD)
-
         # Call Vision API
         result = await call_vision_api(image_b64, prompt, VISION_PROVIDER)
+        if source_key is not None:
+            cache.set(source_key, result)
 
         return result
 
@@ -241,26 +663,25 @@ async def extract_text_from_pdf(
     pdf_path: str,
     pages: Optional[str] = None,
     mode: Literal["standard", "compact", "handwriting"] = "standard",
-    dpi: int = 200
+    dpi: int = 150,
+    ctx: Context | None = None,
 ) -> str:
     """
     Extract text from a PDF document using Vision AI.
 
     Converts PDF pages to images and processes them with Vision API.
-    Requires poppler-utils to be installed on the system.
+    Uses PyMuPDF when installed, otherwise requires poppler-utils.
 
     Args:
         pdf_path: Path to the PDF file
         pages: Page range to process (e.g., "1-5", "1,3,5", or None for all)
         mode: OCR mode - "standard", "compact", or "handwriting"
         dpi: Resolution for PDF to image conversion (higher = better quality, slower)
+        ctx: Injected by FastMCP; used to report per-page progress to the client
 
     Returns:
         Extracted text from all processed pages
     """
-    from pdf2image import convert_from_path
-    from PIL import Image
-
     path = Path(pdf_path).expanduser().resolve()
 
     if not path.exists():
@@ -286,55 +707,134 @@ async def extract_text_from_pdf(
                 first_page = int(pages)
                 last_page = int(pages)
 
-        # Convert PDF to images
-        logger.info(f"Converting PDF to images: {path}, dpi={dpi}")
-
+        # Resolve the requested pages against the real page count up front so
+        # rendering can be streamed in windows (out-of-range pages are skipped).
+        loop = asyncio.get_running_loop()
+        total_pages = await loop.run_in_executor(None, _pdf_page_count, path)
         if specific_pages:
-            # Convert specific pages one by one
-            images = []
-            for page_num in specific_pages:
-                page_images = convert_from_path(
-                    path,
-                    dpi=dpi,
-                    first_page=page_num,
-                    last_page=page_num
-                )
-                images.extend(page_images)
+            page_nums = [p for p in specific_pages if 1 <= p <= total_pages]
         else:
-            images = convert_from_path(
-                path,
-                dpi=dpi,
-                first_page=first_page,
-                last_page=last_page
-            )
+            hi = min(last_page or total_pages, total_pages)
+            page_nums = list(range(first_page or 1, hi + 1))
+
+        prompt = OCR_PROMPTS.get(mode, OCR_PROMPT_STANDARD)
+        texts: dict[int, str] = {}
+
+        # Pages OCR'd before (same file bytes, page, dpi, prompt) are served
+        # from the cache and never rendered.
+        cache = _get_ocr_cache()
+        page_keys: dict[int, str] = {}
+        if cache.enabled:
+            digest = await loop.run_in_executor(None, _file_digest, path)
+            for n in page_nums:
+                page_keys[n] = _source_cache_key(digest, "pdf", n, dpi, prompt)
+                cached = cache.get(page_keys[n])
+                if cached is not None:
+                    texts[n] = f"## Page {n}\n\n{cached}"
+        to_render = [n for n in page_nums if n not in texts]
+        if len(to_render) < len(page_nums):
+            logger.info(f"OCR cache hit for {len(page_nums) - len(to_render)} pages")
+
+        logger.info(f"Converting PDF to images: {path}, dpi={dpi}, pages={len(to_render)}")
+
+        # Three-stage pipeline connected by bounded queues: one renderer
+        # (PyMuPDF/poppler aren't safe to share across threads), a few CPU
+        # workers for preprocess + JPEG/base64, and OCR_CONCURRENCY Vision
+        # callers. Rendering overlaps API latency, and only the small
+        # base64 payloads wait on the API, not full-resolution bitmaps.
+        # Progress notifications as each page finishes, so clients see the
+        # document advancing instead of waiting on the whole batch.
+        async def _page_done(page_num: int) -> None:
+            if ctx is None:
+                return
+            try:
+                await ctx.report_progress(len(texts), len(page_nums), f"Page {page_num} done")
+            except Exception as e:
+                logger.debug(f"Progress report failed: {e}")
 
-        logger.info(f"Converted {len(images)} pages")
+        render_q: asyncio.Queue = asyncio.Queue(maxsize=PDF_RENDER_CHUNK)
+        prep_q: asyncio.Queue = asyncio.Queue(maxsize=OCR_CONCURRENCY)
 
-        # Process each page
-        results = []
-        prompts = {
-            "standard": OCR_PROMPT_STANDARD,
-            "compact": OCR_PROMPT_COMPACT,
-            "handwriting": OCR_PROMPT_HANDWRITING
-        }
-        prompt = prompts.get(mode, OCR_PROMPT_STANDARD)
+        def _encode(image) -> str:
+            try:
+                return image_to_base64(preprocess_image(image, enhance=True))
+            finally:
+                image.close()  # drop the page bitmap as soon as it's encoded
 
-        for i, image in enumerate(images, 1):
-            page_num = specific_pages[i-1] if specific_pages else (first_page or 1) + i - 1
-            logger.info(f"Processing page {page_num}...")
+        async def _render_stage(pages_iter) -> None:
+            # next() runs on a worker thread and keeps running if this task is
+            # cancelled mid-render; closing the generator then would raise
+            # "generator already executing". The lock orders close after it.
+            iter_lock = threading.Lock()
 
-            # Preprocess
-            image = preprocess_image(image, enhance=True)
+            def _next_page():
+                with iter_lock:
+                    return next(pages_iter, None)
 
-            # Convert to base64
-            image_b64 = image_to_base64(image)
+            def _close_pages() -> None:
+                with iter_lock:
+                    pages_iter.close()
 
-            # Call Vision API
             try:
-                text = await call_vision_api(image_b64, prompt, VISION_PROVIDER)
-                results.append(f"## Page {page_num}\n\n{text}")
-            except Exception as e:
-                results.append(f"## Page {page_num}\n\n[Error: {str(e)}]")
+                while True:
+                    item = await loop.run_in_executor(None, _next_page)
+                    if item is None:
+                        break
+                    await render_q.put(item)
+            finally:
+                if iter_lock.acquire(blocking=False):
+                    try:
+                        pages_iter.close()
+                    finally:
+                        iter_lock.release()
+                else:
+                    loop.run_in_executor(None, _close_pages)
+                for _ in range(PREPROCESS_WORKERS):
+                    await render_q.put(None)
+
+        async def _preprocess_stage() -> None:
+            while (item := await render_q.get()) is not None:
+                page_num, image = item
+                logger.info(f"Processing page {page_num}...")
+                try:
+                    image_b64 = await loop.run_in_executor(None, _encode, image)
+                except Exception as e:
+                    texts[page_num] = f"## Page {page_num}\n\n[Error: {str(e)}]"
+                    await _page_done(page_num)
+                    continue
+                await prep_q.put((page_num, image_b64))
+
+        async def _vision_stage() -> None:
+            while (item := await prep_q.get()) is not None:
+                page_num, image_b64 = item
+                try:
+                    text = await call_vision_api(image_b64, prompt, VISION_PROVIDER)
+                    texts[page_num] = f"## Page {page_num}\n\n{text}"
+                    if page_num in page_keys:
+                        cache.set(page_keys[page_num], text)
+                except Exception as e:
+                    texts[page_num] = f"## Page {page_num}\n\n[Error: {str(e)}]"
+                await _page_done(page_num)
+
+        vision_tasks = [asyncio.create_task(_vision_stage()) for _ in range(OCR_CONCURRENCY)]
+        try:
+            outcomes = await asyncio.gather(
+                _render_stage(_iter_page_images(path, dpi, to_render)),
+                *(_preprocess_stage() for _ in range(PREPROCESS_WORKERS)),
+                return_exceptions=True,
+            )
+            for _ in vision_tasks:
+                await prep_q.put(None)
+            await asyncio.gather(*vision_tasks)
+        finally:
+            for task in vision_tasks:
+                task.cancel()
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+        results = [texts[n] for n in page_nums if n in texts]
+        logger.info(f"Converted {len(results)} pages")
 
         return "\n\n---\n\n".join(results)
 
@@ -353,22 +853,28 @@ async def get_pdf_info(pdf_path: str) -> str:
     Returns:
         PDF metadata as formatted string
     """
-    from pdf2image.pdf2image import pdfinfo_from_path
-
     path = Path(pdf_path).expanduser().resolve()
 
     if not path.exists():
         return f"Error: File not found: {path}"
 
     try:
-        info = pdfinfo_from_path(path)
+        if fitz is not None:
+            with fitz.open(str(path)) as doc:
+                pages = doc.page_count
+                version = (doc.metadata or {}).get("format", "").removeprefix("PDF ") or "Unknown"
+        else:
+            _require_pdf2image()
+            info = pdfinfo_from_path(path)
+            pages = info.get('Pages', 'Unknown')
+            version = info.get('PDF version', 'Unknown')
 
         result = f"""## PDF Information
 
 **File**: {path.name}
-**Pages**: {info.get('Pages', 'Unknown')}
+**Pages**: {pages}
 **Size**: {path.stat().st_size / 1024:.1f} KB
-**Format**: PDF {info.get('PDF version', 'Unknown')}
+**Format**: PDF {version}
 """
         return result
 
@@ -386,41 +892,49 @@ async def check_dependencies() -> str:
     results = []
 
     # Check pdf2image
-    try:
-        import pdf2image
+    if convert_from_path is not None:
         results.append("✅ pdf2image: installed")
-    except ImportError:
+    else:
         results.append("❌ pdf2image: NOT installed (pip install pdf2image)")
 
     # Check Pillow
-    try:
-        from PIL import Image
+    if Image is not None:
         results.append("✅ Pillow: installed")
-    except ImportError:
+    else:
         results.append("❌ Pillow: NOT installed (pip install Pillow)")
 
-    # Check poppler
-    try:
-        from pdf2image.pdf2image import pdfinfo_from_path
-        # Try to get info from a non-existent file to check poppler
-        import subprocess
-        result = subprocess.run(['pdftoppm', '-v'], capture_output=True, text=True)
-        if result.returncode == 0 or 'pdftoppm' in result.stderr:
-            results.append("✅ poppler: installed")
-        else:
-            results.append("❌ poppler: NOT installed")
-    except Exception:
+    # Check OpenCV (optional)
+    if cv2 is not None:
+        results.append("✅ opencv: installed (fast preprocessing)")
+    else:
+        results.append("⚠️ opencv: not installed, using Pillow (pip install opencv-python-headless)")
+
+    # Check TurboJPEG (optional)
+    if _turbojpeg is not None:
+        results.append("✅ turbojpeg: installed (fast JPEG encoding)")
+    else:
+        results.append("⚠️ turbojpeg: not available, using Pillow (pip install PyTurboJPEG + libturbojpeg)")
+
+    # Check PyMuPDF (optional; replaces poppler for PDFs)
+    if fitz is not None:
+        results.append("✅ PyMuPDF: installed (in-process PDF rendering, poppler not needed)")
+    else:
+        results.append("⚠️ PyMuPDF: not installed, using pdf2image + poppler (pip install pymupdf)")
+
+    # Check poppler (a PATH lookup; no need to spawn pdftoppm)
+    if shutil.which("pdftoppm") is not None:
+        results.append("✅ poppler: installed")
+    else:
         results.append("❌ poppler: NOT installed or not in PATH")
 
     # Check Vision API
-    try:
-        import anthropic
+    if anthropic is not None:
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if api_key:
             results.append("✅ anthropic: installed, API key set")
         else:
             results.append("⚠️ anthropic: installed, but ANTHROPIC_API_KEY not set")
-    except ImportError:
+    else:
         results.append("❌ anthropic: NOT installed (pip install anthropic)")
 
     return "## Dependency Check\n\n" + "\n".join(results)
@@ -27,13 +27,19 @@ dotenv.load_dotenv(env_path)
 # Langfuse is optional — server works without keys
 
 from src.engine.router import SemanticRouter, KEYWORD_VETO_ROUTE_REQUIRED
+from src.engine.vector_store import RETRIEVAL_EXECUTOR
+from src.engine.embedder import embed_query
+from src.engine.context import HistoryText
 from src.engine.enrichment import (
     enrich_agent_prompt,
     infer_tier,
     implant_retriever,
 )
 from src.engine.config import SESSION_CACHE_MAX_SIZE, SESSION_CACHE_TTL_SECONDS, STICKY_SWITCH_THRESHOLD, ROUTER_SIMILARITY_THRESHOLD, get_client_repo_root
-from src.utils.prompt_loader import load_agent_prompt, get_agent_metadata
+from src.utils.prompt_loader import (
+    load_agent_prompt, get_agent_metadata, prewarm_prompt_cache,
+    is_prompt_cached, is_metadata_cached,
+)
 from src.utils.debug_logger import debug_log
 from src.memory.describer import RepoDescriber
 from src.memory.history import HistoryReader, HistoryStore, HistoryWriter
@@ -104,6 +110,7 @@ async def clear_session_cache() -> str:
     """Clears the session cache and sticky agent mappings. Use when switching contexts."""
     SESSION_CACHE.clear()
     CONTEXT_HASH_CACHE.clear()
+    TASK_IMPLANT_CACHE.clear()
     return "Session cache and sticky agent mappings cleared"
 
 _META_QUERY_RE = re.compile(
@@ -121,7 +128,8 @@ def _is_meta_query(query: str) -> bool:
     query_stripped = query.strip()
     if len(query_stripped) < 10:
         return True
-    return bool(_META_QUERY_RE.search(query_stripped))
+    # Anchored pattern: match() tries position 0 only
+    return bool(_META_QUERY_RE.match(query_stripped))
 
 def _normalize_chat_history(chat_history: Optional[List[str] | str]) -> List[str]:
     """
@@ -142,6 +150,12 @@ CONTEXT_HASH_CACHE: TTLCache = TTLCache(maxsize=SESSION_CACHE_MAX_SIZE, ttl=SESS
 def _compute_context_hash(prompt: str) -> str:
     return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
 
+def _session_cache_key(agent_name: str, query: str, tier: str) -> str:
+    """SESSION_CACHE key. Stable across processes, unlike ``hash(query)``,
+    which is salted per interpreter (PYTHONHASHSEED)."""
+    digest = hashlib.blake2b(query.encode("utf-8"), digest_size=8).hexdigest()
+    return f"{agent_name}:{digest}:{tier}"
+
 _ROUTE_REQUIRED_INSTRUCTION = (
     "CRITICAL: You MUST call get_agent_context(agent_name, query) RIGHT NOW as your ONLY next action. "
     "Do NOT call any other tools. Do NOT use Agent, Bash, Read, Grep, or any tool in parallel. "
@@ -163,6 +177,22 @@ def _build_route_required(request_id: str, tier: str, candidates: list) -> str:
     debug_log("route_and_load", "res", result)
     return json.dumps(result, ensure_ascii=False)
 
+async def _agent_metadata(agent_name: str) -> dict:
+    """get_agent_metadata, inline when cached; a cold read + YAML parse runs
+    on a worker thread so it doesn't block the event loop."""
+    if is_metadata_cached(agent_name):
+        return get_agent_metadata(agent_name)
+    return await asyncio.to_thread(get_agent_metadata, agent_name)
+
+
+async def _agent_prompt(agent_name: str) -> str:
+    """load_agent_prompt, inline when cached; cold file reads and @-import
+    expansion run on a worker thread."""
+    if is_prompt_cached(agent_name):
+        return load_agent_prompt(agent_name)
+    return await asyncio.to_thread(load_agent_prompt, agent_name)
+
+
 async def _load_and_enrich(agent_name: str, query: str, chat_history_list: List[str], tier: str | None = None) -> tuple[str, str, list[str], list[str], list[str], str]:
     """Shared helper: load prompt, enrich with rules/skills/implants/capabilities.
     Returns (final_prompt, context_hash, skills_loaded, implants_loaded, rules_loaded, effective_tier).
@@ -171,8 +201,9 @@ async def _load_and_enrich(agent_name: str, query: str, chat_history_list: List[
     if tier is None:
         tier = infer_tier(query)
 
-    loop = asyncio.get_running_loop()
-    metadata = await loop.run_in_executor(None, get_agent_metadata, agent_name)
+    # Prompt and metadata are cached per file mtime (warmed at startup): warm
+    # lookups are a few stat() calls and stay inline, cold ones go to a thread.
+    metadata = await _agent_metadata(agent_name)
     core_skills = metadata.get("core_skills", []) or []
     preferred_skills = metadata.get("preferred_skills", []) or []
     capable_skills = metadata.get("capable_skills", []) or []
@@ -186,8 +217,7 @@ async def _load_and_enrich(agent_name: str, query: str, chat_history_list: List[
         tier = "standard"
         logger.info(f"Tier promoted to 'standard' for {agent_name} (preferred implants declared)")
 
-    query_hash = hash(query)
-    cache_key = f"{agent_name}:{query_hash}:{tier}"
+    cache_key = _session_cache_key(agent_name, query, tier)
     if cache_key in SESSION_CACHE:
         cached = SESSION_CACHE[cache_key]
         cache_used = False
@@ -213,7 +243,7 @@ async def _load_and_enrich(agent_name: str, query: str, chat_history_list: List[
         debug_log("_load_and_enrich", "cache_corrupt", {"agent": agent_name, "tier": tier, "shape": str(type(cached))})
         del SESSION_CACHE[cache_key]
 
-    base_prompt = await loop.run_in_executor(None, load_agent_prompt, agent_name)
+    base_prompt = await _agent_prompt(agent_name)
 
     enrichment = await enrich_agent_prompt(
         agent_name,
@@ -304,7 +334,8 @@ async def route_and_load(
     """
     try:
         chat_history_list = _normalize_chat_history(chat_history)
-        history_text = "\n".join(chat_history_list)
+        # Lazy join: the router only reads the last 200 chars of history
+        history_text = HistoryText(chat_history_list)
         request_id = str(uuid.uuid4())
         tier = infer_tier(query)
         debug_log("route_and_load", "req", {
@@ -312,6 +343,14 @@ async def route_and_load(
             "history_len": len(chat_history_list), "request_id": request_id,
         })
 
+        # Prefetch the bare-query embedding while routing runs. The router embeds
+        # the history-prefixed text, but skill retrieval and update_cache embed
+        # ``query`` itself; the result lands in embed_query's cache. Without
+        # history both texts are identical, so there is nothing to overlap.
+        if history_text:
+            prefetch = asyncio.get_running_loop().run_in_executor(RETRIEVAL_EXECUTOR, embed_query, query)
+            prefetch.add_done_callback(lambda f: f.cancelled() or f.exception())  # best-effort; errors resurface on the real call
+
         # 1. Sticky agent: if we already have an active agent, prefer keeping it
         explicit_tier = None  # only set for intentional overrides (e.g. meta-query)
         should_cache = True  # skip caching for unvalidated sticky decisions
@@ -547,6 +586,17 @@ async def get_agent_context(agent_name: str, query: str, reasoning: str = "Selec
         debug_log("get_agent_context", "error", result)
         return json.dumps(result, ensure_ascii=False)
 
+# Fixed implant bundles for load_implants(task_type=...), as store ids.
+TASK_IMPLANT_IDS = {
+    "debugging": ("implant-chain-of-code.mdc", "implant-reflexion.mdc", "implant-react.mdc"),
+    "analysis": ("implant-step-back-prompting.mdc", "implant-chain-of-verification.mdc"),
+    "creative": ("implant-analogical-prompting.mdc", "implant-generated-knowledge.mdc"),
+    "planning": ("implant-plan-and-solve-plus.mdc", "implant-skeleton-of-thought.mdc"),
+}
+# Formatted bundle per task_type; bounded by the session TTL so re-indexed
+# implants show up, and cleared with the session cache.
+TASK_IMPLANT_CACHE: TTLCache = TTLCache(maxsize=len(TASK_IMPLANT_IDS), ttl=SESSION_CACHE_TTL_SECONDS)
+
 @mcp.tool()
 @observe(name="load_implants")
 async def load_implants(
@@ -566,29 +616,23 @@ async def load_implants(
       creative   → analogical-prompting, generated-knowledge
       planning   → plan-and-solve, skeleton-of-thought
     """
-    TASK_IMPLANT_MAP = {
-        "debugging": ["implant-chain-of-code", "implant-reflexion", "implant-react"],
-        "analysis": ["implant-step-back-prompting", "implant-chain-of-verification"],
-        "creative": ["implant-analogical-prompting", "implant-generated-knowledge"],
-        "planning": ["implant-plan-and-solve-plus", "implant-skeleton-of-thought"],
-    }
-
     loop = asyncio.get_running_loop()
     debug_log("load_implants", "req", {"query": query, "task_type": task_type, "limit": limit})
 
     try:
         if task_type:
-            implant_names = TASK_IMPLANT_MAP.get(task_type)
-            if not implant_names:
-                return f"Unknown task_type: {task_type}. Valid: {', '.join(TASK_IMPLANT_MAP)}"
+            target_ids = TASK_IMPLANT_IDS.get(task_type)
+            if not target_ids:
+                return f"Unknown task_type: {task_type}. Valid: {', '.join(TASK_IMPLANT_IDS)}"
+
+            cached = TASK_IMPLANT_CACHE.get(task_type)
+            if cached is not None:
+                debug_log("load_implants", "res", {"cache": "hit", "result_len": len(cached)})
+                return cached
 
-            target_ids = [
-                f"{n}.mdc" if not n.endswith(".mdc") else n
-                for n in implant_names
-            ]
             results = await loop.run_in_executor(
-                None,
-                lambda: implant_retriever.store.get(ids=target_ids),
+                RETRIEVAL_EXECUTOR,
+                lambda: implant_retriever.store.get(ids=list(target_ids)),
             )
             implants = [
                 {
@@ -603,11 +647,13 @@ async def load_implants(
             if not query:
                 return "Provide either 'query' or 'task_type'."
             implants = await loop.run_in_executor(
-                None,
+                RETRIEVAL_EXECUTOR,
                 lambda: implant_retriever.retrieve(query=query, n_results=limit),
             )
 
         result = implant_retriever.format_implants_for_prompt(implants)
+        if task_type and implants:
+            TASK_IMPLANT_CACHE[task_type] = result
         debug_log("load_implants", "res", {"implant_count": len(implants), "result_len": len(result)})
         return result
     except Exception as e:
@@ -627,10 +673,9 @@ async def list_agents(include_metadata: bool = True) -> str:
     if not include_metadata:
         return json.dumps({"agents": agents}, ensure_ascii=False)
 
-    loop = asyncio.get_running_loop()
     catalog = []
     for name in agents:
-        meta = await loop.run_in_executor(None, get_agent_metadata, name)
+        meta = await _agent_metadata(name)
         identity = meta.get("identity", {})
         routing = meta.get("routing", {})
         catalog.append({
@@ -708,7 +753,8 @@ async def log_interaction(
                     metadata={"agent": agent_name, "reasoning": reasoning or ""},
                 ) as gen:
                     gen.update(output=response_content[:5000])
-            langfuse.flush()
+            # No flush here: the SDK exports batches from its own background
+            # thread, and atexit flushes the remainder on shutdown.
             return {"status": "logged", "trace_id": trace_id}
         except Exception as e:
             logger.error("Langfuse logging failed: %s", e, exc_info=True)
@@ -1123,7 +1169,31 @@ def _warmup_rules():
         logger.warning("Rules layer warmup failed: %s", e, exc_info=True)
 
 
+def _warmup_agent_prompts():
+    """Resolve every agent's prompt and frontmatter once at startup.
+
+    Both are cached by file mtime in ``prompt_loader``, so requests only
+    stat the files instead of reading, inlining @-imports and parsing YAML
+    on the event loop.
+    """
+    try:
+        files = prewarm_prompt_cache()
+        logger.info("Prompt file cache warmed up: %d file(s)", files)
+    except Exception as e:
+        logger.warning("Prompt file cache warmup failed: %s", e)
+    loaded = 0
+    for name in router.available_agents:
+        try:
+            get_agent_metadata(name)
+            load_agent_prompt(name)
+            loaded += 1
+        except Exception as e:
+            logger.warning("Agent prompt warmup failed for %s: %s", name, e)
+    logger.info("Agent prompts warmed up: %d agent(s)", loaded)
+
+
 if __name__ == "__main__":
     _warmup_embedding_model()
     _warmup_rules()
+    _warmup_agent_prompts()
     mcp.run()
@@ -51,8 +51,14 @@ try:
 
     # Check if keys are actually configured
     has_keys = bool(os.getenv("LANGFUSE_PUBLIC_KEY")) and bool(os.getenv("LANGFUSE_SECRET_KEY"))
+    # Explicit kill switch: keeps keys in .env but leaves hot-path functions
+    # undecorated (no per-call span construction or arg serialization).
+    enabled = os.getenv("LANGFUSE_ENABLED", "1").lower() in ("1", "true")
 
-    if has_keys:
+    if has_keys and not enabled:
+        _real_observe_ref = None
+        logger.info("Langfuse disabled (LANGFUSE_ENABLED=%s)", os.getenv("LANGFUSE_ENABLED"))
+    elif has_keys:
         _langfuse_available = True
         _real_observe_ref = _real_observe
         logger.info("Langfuse enabled (keys found)")
@@ -1,14 +1,62 @@
+import functools
 import os
 import re
-import yaml
-from typing import Set, Tuple, Optional
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Set, Tuple, Optional
+
+from src.engine.config import INSTALL_ROOT, SKILLS_DIR, IMPLANTS_DIR, AGENTS_DIR
+
+# Canonical forms of the install directories, resolved once at import
+# instead of re-running realpath/normpath (an lstat per path component) on
+# every prompt load.
+_INSTALL_ROOT_REAL = os.path.realpath(INSTALL_ROOT)
+_AGENTS_DIR_REAL = os.path.realpath(AGENTS_DIR)
+_SKILLS_DIR_NORM = os.path.normpath(SKILLS_DIR)
+_IMPLANTS_DIR_NORM = os.path.normpath(IMPLANTS_DIR)
+
+# Resolved agent prompts and parsed agent frontmatter, each stored with the
+# st_mtime_ns of every file it was built from. Agents are a small static set,
+# so after the first load a request costs a stat() per file instead of the
+# reads, @-import resolution and YAML parse; editing any file re-reads it.
+_prompt_cache: Dict[str, Tuple[Tuple[Tuple[str, int], ...], str]] = {}
+_metadata_cache: Dict[str, Tuple[int, dict]] = {}
+# Prompt builds in progress, keyed like _prompt_cache.
+_prompt_inflight: Dict[str, Future] = {}
+_prompt_inflight_lock = threading.Lock()
+
+def _load_yaml(text: str):
+    """Parse frontmatter YAML. PyYAML is imported on first use: callers that
+    only need prompt bodies never pay for it."""
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader
+    return yaml.load(text, Loader=SafeLoader)
+
+def _is_within(path: str, root: str) -> bool:
+    """True if *path* is *root* or below it. Both must already be realpaths,
+    so a plain separator-anchored prefix test is exact (no commonpath split)."""
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
 
-from src.engine.config import REPO_ROOT, SKILLS_DIR, IMPLANTS_DIR, AGENTS_DIR
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1  # missing: picked up once the file appears
 
 # Regex to find the closing --- of YAML frontmatter.
 # Matches --- only at the start of a line, avoiding --- inside quoted values.
 _FRONTMATTER_RE = re.compile(r'^---\s*$', re.MULTILINE)
 
+# @-references to other .mdc files inlined by process_imports.
+_IMPORT_RE = re.compile(r'@[\w\./-]+\.mdc')
+
+# Agent names are single directory names: no separators, no "." / "..".
+_AGENT_NAME_RE = re.compile(r'[\w-]+')
+
 
 def split_frontmatter(content: str) -> Tuple[Optional[str], str]:
     """Split MDC content into (frontmatter_yaml, body).
@@ -21,15 +69,18 @@ def split_frontmatter(content: str) -> Tuple[Optional[str], str]:
     if not content.startswith("---"):
         return None, content
 
-    # Find all --- at start-of-line; first is the opening, second is the closing.
-    matches = list(_FRONTMATTER_RE.finditer(content))
-    if len(matches) < 2:
+    # First --- at start-of-line is the opening, second is the closing. Stop
+    # scanning there instead of matching every --- in the body.
+    matches = _FRONTMATTER_RE.finditer(content)
+    opening = next(matches, None)
+    closing = next(matches, None)
+    if closing is None:
         return None, content
 
     # Everything between first and second --- markers
-    fm_start = matches[0].end()    # right after opening --- (end of match, before newline)
-    fm_end = matches[1].start()    # right before closing ---
-    body_start = matches[1].end()  # right after closing --- (end of match, before newline)
+    fm_start = opening.end()     # right after opening --- (end of match, before newline)
+    fm_end = closing.start()     # right before closing ---
+    body_start = closing.end()   # right after closing --- (end of match, before newline)
 
     frontmatter_str = content[fm_start:fm_end]
     body = content[body_start:].strip()
@@ -39,50 +90,89 @@ def split_frontmatter(content: str) -> Tuple[Optional[str], str]:
 def resolve_path(path_ref: str) -> str:
     """
     Resolves a path reference (starting with @ or relative) to an absolute path.
-    Prevents path traversal outside REPO_ROOT.
+    Prevents path traversal outside INSTALL_ROOT.
     """
-    candidate_path = ""
-
+    return _resolve_path_cached(path_ref)
+
+# @-ref prefixes and the directories they map to, tried in order.
+_AT_PREFIXES = (
+    ("agents/", AGENTS_DIR),
+    ("skills/", SKILLS_DIR),
+    ("implants/", IMPLANTS_DIR),
+)
+
+# The install tree is fixed for the process lifetime, so a ref always maps to
+# the same path; shared imports (e.g. core protocol files referenced by every
+# agent) skip the realpath lstat walk after the first lookup. Rejected refs
+# raise and are not cached.
+@functools.lru_cache(maxsize=1024)
+def _resolve_path_cached(path_ref: str) -> str:
     if path_ref.startswith("@"):
         clean_ref = path_ref[1:]  # remove @
 
         # Map known prefixes to their resolved directories
-        if clean_ref.startswith("agents/"):
-            candidate_path = os.path.join(AGENTS_DIR, clean_ref[len("agents/"):])
-        elif clean_ref.startswith("skills/"):
-            candidate_path = os.path.join(SKILLS_DIR, clean_ref[len("skills/"):])
-        elif clean_ref.startswith("implants/"):
-            candidate_path = os.path.join(IMPLANTS_DIR, clean_ref[len("implants/"):])
+        for prefix, base in _AT_PREFIXES:
+            if clean_ref.startswith(prefix):
+                candidate_path = os.path.join(base, clean_ref[len(prefix):])
+                break
         else:
             # Fallback: try repo root directly
-            candidate_path = os.path.join(REPO_ROOT, clean_ref)
+            candidate_path = os.path.join(INSTALL_ROOT, clean_ref)
     else:
-        candidate_path = os.path.join(REPO_ROOT, path_ref)
+        candidate_path = os.path.join(INSTALL_ROOT, path_ref)
 
     # Security Check: Prevent Path Traversal (realpath resolves symlinks)
     abs_path = os.path.realpath(candidate_path)
-    repo_root_real = os.path.realpath(REPO_ROOT)
+    if not _is_within(abs_path, _INSTALL_ROOT_REAL):
+        raise ValueError(f"Security Error: Access denied for path '{path_ref}'. Cannot access outside repository.")
 
-    try:
-        if os.path.commonpath([repo_root_real, abs_path]) != repo_root_real:
-            raise ValueError(f"Security Error: Access denied for path '{path_ref}'. Cannot access outside repository.")
-    except ValueError:
-        # handle edge cases like different drives on Windows, though unlikely in this Linux environment
-        raise ValueError(f"Security Error: Path '{path_ref}' is invalid.")
+    # Interned: different refs to one file, the prewarm walk and every cache
+    # keyed by path then share a single string object.
+    return sys.intern(abs_path)
+
+# Split .mdc files (frontmatter, body) keyed by path and validated by
+# (st_mtime_ns, st_size): a file imported by many agents is read once, and
+# the alwaysApply check and the import itself share that read.
+_file_cache: Dict[str, Tuple[int, int, Optional[str], str]] = {}
+
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
 
-    return abs_path
+def _read_mdc(path: str) -> Tuple[Optional[str], str]:
+    """(frontmatter_yaml, body) of *path*. Raises OSError / UnicodeDecodeError."""
+    cached = _file_cache.get(path)
+    if cached is not None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        if st is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2], cached[3]
+
+    # Cold path: one open; the cache key comes from fstat on the same fd,
+    # and the file is read in a single sized os.read instead of through the
+    # io buffering stack. Newlines are then normalized the way text mode would.
+    fd = os.open(path, _OPEN_FLAGS)
+    try:
+        st = os.fstat(fd)
+        data = os.read(fd, st.st_size)
+        while len(data) < st.st_size:  # short read (e.g. network filesystems)
+            chunk = os.read(fd, st.st_size - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    content = data.decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    # specific to MDC files with frontmatter: remove it if present
+    fm_str, body = split_frontmatter(content)
+    _file_cache[path] = (st.st_mtime_ns, st.st_size, fm_str, body)
+    return fm_str, body
 
 def load_file_content(path: str) -> str:
     try:
-        # Double check existence to avoid race conditions or errors
-        if not os.path.exists(path):
-             return f"[MISSING FILE: {path}]"
-
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # specific to MDC files with frontmatter: remove it if present
-            _, body = split_frontmatter(content)
-            return body
+        return _read_mdc(path)[1]
     except FileNotFoundError:
         return f"[MISSING FILE: {path}]"
     except Exception as e:
@@ -106,96 +196,269 @@ def _should_skip_inline(abs_path: str) -> bool:
     return result
 
 def _compute_skip_inline(norm: str) -> bool:
-    if norm.startswith(os.path.normpath(SKILLS_DIR)):
+    if norm.startswith(_SKILLS_DIR_NORM):
         return True
-    if norm.startswith(os.path.normpath(IMPLANTS_DIR)):
+    if norm.startswith(_IMPLANTS_DIR_NORM):
         return True
 
-    if os.path.exists(norm):
-        try:
-            with open(norm, "r", encoding="utf-8") as f:
-                raw = f.read()
-            fm_str, _ = split_frontmatter(raw)
-            if fm_str is not None:
-                fm = yaml.safe_load(fm_str) or {}
-                if fm.get("alwaysApply") is True:
-                    return True
-        except Exception:
-            pass
+    try:
+        fm_str, _ = _read_mdc(norm)
+        if fm_str is not None:
+            fm = _load_yaml(fm_str) or {}
+            if fm.get("alwaysApply") is True:
+                return True
+    except Exception:
+        pass
     return False
 
-def process_imports(content: str, seen_files: Set[str] = None) -> str:
-    if seen_files is None:
-        seen_files = set()
-
-    def replacer(match):
+class _ImportFrame:
+    """One file being expanded by process_imports: its text, the pending
+    @-matches, and the output assembled so far."""
+
+    __slots__ = ("path", "content", "matches", "parts", "pos", "start", "pure")
+
+    def __init__(self, path: Optional[str], content: str, start: int = 0):
+        self.path = path
+        self.content = content
+        self.matches = _IMPORT_RE.finditer(content)
+        self.parts: List[str] = []
+        self.pos = 0
+        self.start = start  # index of this file's first entry in the trail
+        self.pure = True    # no cycle marker, so the text is context-free
+
+# Fully expanded .mdc files keyed by absolute path, stored with the mtime of
+# every file the expansion read. Shared protocol files imported by many
+# agents are expanded once per process rather than once per agent. Only
+# expansions without a cycle marker are stored: those depend on which
+# files were above them in the import chain.
+_expanded_cache: Dict[str, Tuple[Tuple[Tuple[str, int], ...], str]] = {}
+
+def _expanded_deps(paths: List[str]) -> Tuple[Tuple[str, int], ...]:
+    deps = {}
+    for p in paths:
+        cached = _file_cache.get(p)
+        deps[p] = cached[0] if cached is not None else -1
+    return tuple(deps.items())
+
+def process_imports(content: str, seen_files: Set[str] = None, loaded: Optional[List[str]] = None) -> str:
+    """Inline ``@path.mdc`` references, depth-first.
+
+    Expansion uses an explicit stack instead of recursion. A reference to a
+    file that is still being expanded higher up the chain is reported as
+    circular; a file already expanded earlier (in this call, or in an
+    earlier call while its files are unchanged) is spliced in from memory
+    rather than re-expanded. *seen_files* seeds that chain. Every inlined
+    file's absolute path is appended to *loaded* when given.
+    """
+    if '@' not in content:  # most leaf files import nothing
+        return content
+
+    on_path: Set[str] = set(seen_files or ())
+    # path -> (text, files it was built from, pure)
+    resolved: Dict[str, Tuple[str, Tuple[str, ...], bool]] = {}
+    trail: List[str] = []
+    stack = [_ImportFrame(None, content)]
+
+    while True:
+        frame = stack[-1]
+        match = next(frame.matches, None)
+
+        if match is None:
+            frame.parts.append(frame.content[frame.pos:])
+            text = "".join(frame.parts)
+            stack.pop()
+            if frame.path is not None:
+                on_path.discard(frame.path)
+                paths = trail[frame.start:]
+                resolved[frame.path] = (text, tuple(paths), frame.pure)
+                if frame.pure:
+                    _expanded_cache[frame.path] = (_expanded_deps(paths), text)
+                elif stack:
+                    stack[-1].pure = False
+            if not stack:
+                if loaded is not None:
+                    loaded.extend(dict.fromkeys(trail))
+                return text
+            stack[-1].parts.append(text)
+            continue
+
+        frame.parts.append(frame.content[frame.pos:match.start()])
+        frame.pos = match.end()
         ref = match.group(0)
+
         try:
             abs_path = resolve_path(ref)
         except ValueError as e:
-            return f"[SECURITY BLOCK: {str(e)}]"
-
-        if abs_path in seen_files:
-            return f"[CIRCULAR REFERENCE: {ref}]"
-
-        if _should_skip_inline(abs_path):
-            return f"[Loaded separately: {os.path.basename(abs_path)}]"
-
-        seen_files.add(abs_path)
-        sub_content = load_file_content(abs_path)
-        return process_imports(sub_content, seen_files.copy())
-
-    return re.sub(r'@[\w\./-]+\.mdc', replacer, content)
+            frame.parts.append(f"[SECURITY BLOCK: {str(e)}]")
+            continue
+
+        if abs_path in on_path:
+            frame.parts.append(f"[CIRCULAR REFERENCE: {ref}]")
+            frame.pure = False
+        elif abs_path in resolved:
+            text, paths, pure = resolved[abs_path]
+            frame.parts.append(text)
+            trail.extend(paths)
+            if not pure:
+                frame.pure = False
+        elif _should_skip_inline(abs_path):
+            frame.parts.append(f"[Loaded separately: {os.path.basename(abs_path)}]")
+        else:
+            memo = _expanded_cache.get(abs_path)
+            paths = tuple(p for p, _ in memo[0]) if memo is not None else ()
+            if (memo is not None and on_path.isdisjoint(paths)
+                    and all(_mtime_ns(p) == m for p, m in memo[0])):
+                resolved[abs_path] = (memo[1], paths, True)
+                frame.parts.append(memo[1])
+                trail.extend(paths)
+                continue
+            on_path.add(abs_path)
+            stack.append(_ImportFrame(abs_path, load_file_content(abs_path), len(trail)))
+            trail.append(abs_path)
 
 def get_agent_metadata(agent_name: str) -> dict:
     """
     Reads the frontmatter metadata from the agent's system prompt.
     """
+    if not _AGENT_NAME_RE.fullmatch(agent_name):
+        return {}
     base_path = os.path.join(AGENTS_DIR, agent_name, "system_prompt.mdc")
 
-    # Security: ensure the resolved path stays within AGENTS_DIR (realpath resolves symlinks)
-    abs_path = os.path.realpath(base_path)
-    agents_dir_real = os.path.realpath(AGENTS_DIR)
-    try:
-        if os.path.commonpath([agents_dir_real, abs_path]) != agents_dir_real:
-            return {}
-    except ValueError:
+    mtime = _mtime_ns(base_path)
+    if mtime < 0:
         return {}
+    # Entries are only stored for paths that passed the check below.
+    cached = _metadata_cache.get(base_path)
+    if cached is not None and cached[0] == mtime:
+        return dict(cached[1])
 
-    if not os.path.exists(base_path):
+    # Security: ensure the resolved path stays within AGENTS_DIR (realpath resolves symlinks)
+    if not _is_within(os.path.realpath(base_path), _AGENTS_DIR_REAL):
         return {}
 
+    meta = {}
     try:
-        with open(base_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        fm_str, _ = split_frontmatter(content)
+        # Same split (and cache entry) load_agent_prompt uses for this file,
+        # so only the frontmatter slice is parsed and the file is read once.
+        fm_str, _ = _read_mdc(base_path)
         if fm_str is not None:
-            return yaml.safe_load(fm_str) or {}
+            meta = _load_yaml(fm_str) or {}
     except Exception:
         pass
 
-    return {}
+    _metadata_cache[base_path] = (mtime, meta)
+    return dict(meta)
 
 def load_agent_prompt(agent_name: str) -> str:
     """
     Loads the system prompt for a specific agent, resolving imports.
     """
+    if not _AGENT_NAME_RE.fullmatch(agent_name):
+        raise ValueError(f"Invalid agent name: {agent_name}")
     base_path = os.path.join(AGENTS_DIR, agent_name, "system_prompt.mdc")
 
-    # Security: ensure the resolved path stays within AGENTS_DIR (realpath resolves symlinks)
-    abs_path = os.path.realpath(base_path)
-    agents_dir_real = os.path.realpath(AGENTS_DIR)
+    # Entries are only stored for names that passed the checks below, and a
+    # deleted or edited file fails the mtime match, so a hit is just stats.
+    cached = _prompt_cache.get(base_path)
+    if cached is not None and all(_mtime_ns(p) == m for p, m in cached[0]):
+        return cached[1]
+
+    # Single-flight: concurrent misses for the same agent wait on the first
+    # caller's build instead of each reading and expanding the same files.
+    with _prompt_inflight_lock:
+        pending = _prompt_inflight.get(base_path)
+        if pending is None:
+            pending = _prompt_inflight[base_path] = Future()
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        return pending.result()
+
     try:
-        if os.path.commonpath([agents_dir_real, abs_path]) != agents_dir_real:
-            raise ValueError(f"Invalid agent name: {agent_name}")
-    except ValueError:
+        content = _build_agent_prompt(agent_name, base_path)
+        pending.set_result(content)
+        return content
+    except BaseException as e:
+        pending.set_exception(e)
+        raise
+    finally:
+        with _prompt_inflight_lock:
+            _prompt_inflight.pop(base_path, None)
+
+def _build_agent_prompt(agent_name: str, base_path: str) -> str:
+    # Security: ensure the resolved path stays within AGENTS_DIR (realpath resolves symlinks)
+    if not _is_within(os.path.realpath(base_path), _AGENTS_DIR_REAL):
         raise ValueError(f"Invalid agent name: {agent_name}")
 
-    if not os.path.exists(base_path):
-        # Maybe it's just in the folder
+    # One stat doubles as the existence check and the cache dependency stamp
+    mtime = _mtime_ns(base_path)
+    if mtime < 0:
         raise FileNotFoundError(f"Agent prompt not found for '{agent_name}' at {base_path}")
 
     raw_content = load_file_content(base_path)
-    processed_content = process_imports(raw_content)
+    loaded: List[str] = []
+    processed_content = process_imports(raw_content, loaded=loaded)
 
+    deps = ((base_path, mtime),) + tuple((p, _mtime_ns(p)) for p in loaded)
+    _prompt_cache[base_path] = (deps, processed_content)
     return processed_content
+
+def is_metadata_cached(agent_name: str) -> bool:
+    """True if get_agent_metadata(agent_name) is served from memory (a stat)."""
+    if not _AGENT_NAME_RE.fullmatch(agent_name):
+        return False
+    base_path = os.path.join(AGENTS_DIR, agent_name, "system_prompt.mdc")
+    cached = _metadata_cache.get(base_path)
+    return cached is not None and cached[0] == _mtime_ns(base_path)
+
+def is_prompt_cached(agent_name: str) -> bool:
+    """True if load_agent_prompt(agent_name) is served from memory (stats only).
+
+    Lets async callers run the loader inline when warm and hand cold loads
+    (file reads, @-import expansion) to a worker thread.
+    """
+    if not _AGENT_NAME_RE.fullmatch(agent_name):
+        return False
+    base_path = os.path.join(AGENTS_DIR, agent_name, "system_prompt.mdc")
+    cached = _prompt_cache.get(base_path)
+    return cached is not None and all(_mtime_ns(p) == m for p, m in cached[0])
+
+def invalidate_cache() -> None:
+    """Drop all cached prompts, metadata, file bodies and resolved paths.
+
+    Edits are already picked up by mtime; this forces a cold reload (tests,
+    or files replaced with a preserved mtime).
+    """
+    _prompt_cache.clear()
+    _metadata_cache.clear()
+    _file_cache.clear()
+    _expanded_cache.clear()
+    _skip_inline_cache.clear()
+    _resolve_path_cached.cache_clear()
+
+def _prewarm_one(path: str) -> bool:
+    try:
+        _read_mdc(path)
+        return True
+    except (OSError, UnicodeDecodeError):
+        return False  # surfaced with a marker when actually loaded
+
+def prewarm_prompt_cache() -> int:
+    """Read every ``.mdc`` under AGENTS_DIR into the file cache.
+
+    Agent prompts and the shared files they @-import are a small static set;
+    loading them in one walk at startup leaves requests with a stat() per
+    file. Reads are overlapped on a small thread pool since each is mostly
+    open/read latency. Returns the number of files cached.
+    """
+    paths = []
+    for dirpath, _, files in os.walk(_AGENTS_DIR_REAL):
+        for name in files:
+            if name.endswith(".mdc"):
+                # Same key resolve_path() produces for an @-import of this file
+                paths.append(sys.intern(os.path.realpath(os.path.join(dirpath, name))))
+    if not paths:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(16, len(paths))) as ex:
+        return sum(ex.map(_prewarm_one, paths))
@@ -0,0 +1,67 @@
+"""Tests for scripts/clean_whitespace.py's unchanged-file skip logic."""
+
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "clean_whitespace.py"
+_spec = importlib.util.spec_from_file_location("clean_whitespace", _SCRIPT)
+clean_whitespace = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(clean_whitespace)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    return root, str(tmp_path / "cache.json")
+
+
+def _set_mtime(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_dirty_file_cleaned_then_skipped(tree, monkeypatch):
+    root, cache = tree
+    (root / "a.md").write_text("x\n\n\n\ny\n\n", encoding="utf-8")
+    assert clean_whitespace.clean_tree(str(root), cache) == 1
+    assert (root / "a.md").read_text(encoding="utf-8") == "x\n\ny\n"
+
+    monkeypatch.setattr(clean_whitespace, "clean_file", lambda p: pytest.fail("re-checked"))
+    assert clean_whitespace.clean_tree(str(root), cache) == 0
+
+
+def test_dirty_file_with_older_mtime_is_rechecked(tree):
+    root, cache = tree
+    path = root / "a.md"
+    path.write_text("clean\n", encoding="utf-8")
+    _set_mtime(path, 2_000_000_000_000_000_000)
+    clean_whitespace.clean_tree(str(root), cache)
+
+    # e.g. `git checkout` restoring an older, dirty version
+    path.write_text("dirty\n\n\n\n", encoding="utf-8")
+    _set_mtime(path, 1_000_000_000_000_000_000)
+    assert clean_whitespace.clean_tree(str(root), cache) == 1
+    assert path.read_text(encoding="utf-8") == "dirty\n"
+
+
+def test_same_mtime_different_size_is_rechecked(tree):
+    root, cache = tree
+    path = root / "a.md"
+    path.write_text("clean\n", encoding="utf-8")
+    mtime = os.stat(path).st_mtime_ns
+    clean_whitespace.clean_tree(str(root), cache)
+
+    path.write_text("clean\n\n\n\n", encoding="utf-8")
+    _set_mtime(path, mtime)
+    assert clean_whitespace.clean_tree(str(root), cache) == 1
+
+
+def test_stale_cache_format_is_ignored(tree):
+    root, cache = tree
+    path = root / "a.md"
+    path.write_text("dirty\n\n\n\n", encoding="utf-8")
+    clean_whitespace.save_mtime_cache(cache, {"a.md": 9e18})
+    assert clean_whitespace.clean_tree(str(root), cache) == 1
@@ -0,0 +1,39 @@
+"""
+Unit tests for ContextRetriever history formatting.
+"""
+
+import pytest
+
+from src.engine.context import ContextRetriever, HistoryText
+
+
+class TestHistoryText:
+    LINES = ["first line", "", "second", "a much longer third line of history"]
+
+    @pytest.mark.parametrize("n", [1, 5, 7, 40, 51, 1000])
+    def test_tail_matches_full_join(self, n):
+        full = "\n".join(self.LINES)
+        ht = HistoryText(self.LINES)
+        assert ht[-n:] == full[-n:]
+        assert ht.tail_chars(n) == full[-n:]
+        assert ht.tail_chars(0) == ""
+
+    def test_behaves_like_joined_string(self):
+        full = "\n".join(self.LINES)
+        ht = HistoryText(self.LINES)
+        assert len(ht) == len(full)
+        assert ht == full
+        assert str(ht) == full
+        assert ht[:5] == full[:5]
+
+    def test_empty_history_is_falsy(self):
+        assert not HistoryText([])
+        assert HistoryText([]) == ""
+        assert HistoryText(["", ""])  # joins to "\n"
+
+
+class TestContextRetriever:
+    def test_history_is_joined(self):
+        ctx = ContextRetriever().retrieve("Hello there, how are you?", history=["a", "b"])
+        assert ctx["history_text"] == "a\nb"
+        assert ctx["history_list"] == ["a", "b"]
@@ -0,0 +1,256 @@
+"""Tests for the document OCR server's PDF pipeline and Vision API retry
+(no poppler, PyMuPDF or network: rendering and the API are faked)."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from src.mcp_servers.document_ocr import server as ocr
+
+
+class _RateLimitError(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("rate limited")
+        headers = {} if retry_after is None else {"retry-after": str(retry_after)}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class _BadRequestError(Exception):
+    pass
+
+
+@pytest.fixture
+def fake_anthropic(monkeypatch):
+    monkeypatch.setattr(ocr, "anthropic", SimpleNamespace(
+        RateLimitError=_RateLimitError,
+        InternalServerError=type("InternalServerError", (Exception,), {}),
+        APIConnectionError=type("APIConnectionError", (Exception,), {}),
+    ))
+
+
+@pytest.fixture
+def no_bucket_sleeps(monkeypatch):
+    monkeypatch.setattr(ocr, "_vision_bucket", None)
+    delays = []
+
+    async def _sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(ocr.asyncio, "sleep", _sleep)
+    return delays
+
+
+@pytest.fixture
+def fake_pdf(tmp_path, monkeypatch):
+    """A 5-page 'PDF' whose pages render as n-pixel-wide images."""
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"%PDF-1.4\n")
+    monkeypatch.setattr(ocr, "_pdf_page_count", lambda p: 5)
+    monkeypatch.setattr(ocr, "_get_ocr_cache", lambda: ocr._OcrCache("", 0))
+    monkeypatch.setattr(ocr, "preprocess_image", lambda image, enhance=True: image)
+    monkeypatch.setattr(ocr, "image_to_base64", lambda image: f"img{image.width}")
+    return path
+
+
+def test_is_retryable_only_for_transient_errors(fake_anthropic):
+    assert ocr._is_retryable(_RateLimitError())
+    assert ocr._is_retryable(ocr.anthropic.InternalServerError())
+    assert not ocr._is_retryable(_BadRequestError())
+
+
+def test_rate_limited_retries_then_succeeds(fake_anthropic, no_bucket_sleeps):
+    calls = []
+
+    @ocr.rate_limited
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _RateLimitError(retry_after=3)
+        return "ok"
+
+    assert asyncio.run(flaky()) == "ok"
+    assert len(calls) == 3
+    assert len(no_bucket_sleeps) == 2
+    assert all(3.0 <= d <= 3.75 for d in no_bucket_sleeps)
+
+
+def test_rate_limited_gives_up_after_max_attempts(fake_anthropic, no_bucket_sleeps):
+    calls = []
+
+    @ocr.rate_limited
+    async def always_limited():
+        calls.append(1)
+        raise _RateLimitError()
+
+    with pytest.raises(_RateLimitError):
+        asyncio.run(always_limited())
+    assert len(calls) == ocr.VISION_MAX_ATTEMPTS
+
+
+def test_rate_limited_does_not_retry_other_errors(fake_anthropic, no_bucket_sleeps):
+    calls = []
+
+    @ocr.rate_limited
+    async def broken():
+        calls.append(1)
+        raise _BadRequestError()
+
+    with pytest.raises(_BadRequestError):
+        asyncio.run(broken())
+    assert len(calls) == 1
+    assert no_bucket_sleeps == []
+
+
+def test_token_bucket_spaces_acquisitions():
+    async def _run():
+        bucket = ocr.AsyncTokenBucket(rps=50)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(_run()) >= 3 / 50 * 0.9
+
+
+def test_pdf_pipeline_returns_pages_in_order(fake_pdf, monkeypatch):
+    def _pages(path, dpi, page_nums, chunk=ocr.PDF_RENDER_CHUNK):
+        for n in page_nums:
+            yield n, Image.new("RGB", (n, 1))
+
+    async def _vision(image_b64, prompt, provider):
+        # Later pages answer first, so results arrive out of order
+        await asyncio.sleep(0.01 * (6 - int(image_b64[3:])))
+        if image_b64 == "img4":
+            raise RuntimeError("boom")
+        return f"text of {image_b64}"
+
+    monkeypatch.setattr(ocr, "_iter_page_images", _pages)
+    monkeypatch.setattr(ocr, "call_vision_api", _vision)
+
+    result = asyncio.run(ocr.extract_text_from_pdf(str(fake_pdf), pages="2-5"))
+
+    assert result.split("\n\n---\n\n") == [
+        "## Page 2\n\ntext of img2",
+        "## Page 3\n\ntext of img3",
+        "## Page 4\n\n[Error: boom]",
+        "## Page 5\n\ntext of img5",
+    ]
+
+
+def test_cancel_mid_render_closes_page_iterator(fake_pdf, monkeypatch):
+    rendering = threading.Event()
+    release = threading.Event()
+    closed = threading.Event()
+    generators = []  # keep the generator alive so only an explicit close() ends it
+
+    def _render(path, dpi, page_nums, chunk):
+        try:
+            rendering.set()
+            release.wait(5)
+            yield 1, Image.new("RGB", (1, 1))
+        finally:
+            closed.set()
+
+    def _pages(path, dpi, page_nums, chunk=ocr.PDF_RENDER_CHUNK):
+        generators.append(_render(path, dpi, page_nums, chunk))
+        return generators[-1]
+
+    async def _vision(image_b64, prompt, provider):
+        return "text"
+
+    monkeypatch.setattr(ocr, "_iter_page_images", _pages)
+    monkeypatch.setattr(ocr, "call_vision_api", _vision)
+
+    async def _run():
+        task = asyncio.create_task(ocr.extract_text_from_pdf(str(fake_pdf)))
+        while not rendering.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+        return await asyncio.get_running_loop().run_in_executor(None, closed.wait, 5)
+
+    assert asyncio.run(_run())
+
+
+@pytest.fixture
+def cached_pdf(fake_pdf, tmp_path, monkeypatch):
+    """fake_pdf with a real on-disk OCR cache; counts renders and API calls.
+
+    Page 3's Vision call fails while ``fail_page_3`` is set.
+    """
+    cache = ocr._OcrCache(str(tmp_path / "ocr_cache.sqlite3"), ocr.OCR_CACHE_TTL_SECONDS)
+    calls = SimpleNamespace(rendered=[], vision=[], fail_page_3=False)
+
+    def _pages(path, dpi, page_nums, chunk=ocr.PDF_RENDER_CHUNK):
+        for n in page_nums:
+            calls.rendered.append(n)
+            yield n, Image.new("RGB", (n, 1))
+
+    async def _vision(image_b64, prompt, provider):
+        calls.vision.append(image_b64)
+        if calls.fail_page_3 and image_b64 == "img3":
+            raise RuntimeError("overloaded")
+        return f"text of {image_b64}"
+
+    monkeypatch.setattr(ocr, "_get_ocr_cache", lambda: cache)
+    monkeypatch.setattr(ocr, "_iter_page_images", _pages)
+    monkeypatch.setattr(ocr, "call_vision_api", _vision)
+    return calls
+
+
+def _ocr_pdf(path, **kwargs):
+    return asyncio.run(ocr.extract_text_from_pdf(str(path), **kwargs))
+
+
+def test_cached_pages_skip_render_and_api(fake_pdf, cached_pdf):
+    first = _ocr_pdf(fake_pdf, pages="1-3")
+    cached_pdf.rendered.clear()
+    cached_pdf.vision.clear()
+
+    assert _ocr_pdf(fake_pdf, pages="1-3") == first
+    assert cached_pdf.rendered == []
+    assert cached_pdf.vision == []
+
+
+def test_only_uncached_pages_are_rendered(fake_pdf, cached_pdf):
+    _ocr_pdf(fake_pdf, pages="1-2")
+    cached_pdf.rendered.clear()
+
+    result = _ocr_pdf(fake_pdf, pages="1-3")
+    assert cached_pdf.rendered == [3]
+    assert result.split("\n\n---\n\n")[0] == "## Page 1\n\ntext of img1"
+
+
+@pytest.mark.parametrize("changed", [{"dpi": 300}, {"mode": "handwriting"}])
+def test_different_dpi_or_mode_misses(fake_pdf, cached_pdf, changed):
+    _ocr_pdf(fake_pdf, pages="1-2")
+    cached_pdf.rendered.clear()
+
+    _ocr_pdf(fake_pdf, pages="1-2", **changed)
+    assert cached_pdf.rendered == [1, 2]
+
+
+def test_changed_file_bytes_miss(fake_pdf, cached_pdf):
+    _ocr_pdf(fake_pdf, pages="1")
+    cached_pdf.rendered.clear()
+
+    fake_pdf.write_bytes(b"%PDF-1.4\n% edited\n")
+    _ocr_pdf(fake_pdf, pages="1")
+    assert cached_pdf.rendered == [1]
+
+
+def test_failed_page_is_not_cached(fake_pdf, cached_pdf):
+    cached_pdf.fail_page_3 = True
+    assert "## Page 3\n\n[Error: overloaded]" in _ocr_pdf(fake_pdf, pages="2-3")
+
+    cached_pdf.fail_page_3 = False
+    cached_pdf.rendered.clear()
+    result = _ocr_pdf(fake_pdf, pages="2-3")
+    assert cached_pdf.rendered == [3]
+    assert "## Page 3\n\ntext of img3" in result
@@ -0,0 +1,90 @@
+"""Tests for the embedder's query-vector caches (no model download)."""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.engine import embedder
+
+
+class _FakeModel:
+    def __init__(self):
+        self.query_calls = 0
+
+    def query_embed(self, texts):
+        self.query_calls += 1
+        for t in texts:
+            yield np.full(4, float(len(t)), dtype=np.float32)
+
+
+@pytest.fixture
+def fake_model(tmp_path, monkeypatch):
+    model = _FakeModel()
+    monkeypatch.setattr(embedder, "_model", model)
+    monkeypatch.setattr(embedder, "EMBED_CACHE_PATH", str(tmp_path / "embed_cache.sqlite3"))
+    monkeypatch.setattr(embedder, "_disk_cache", None)
+    embedder._query_cache.clear()
+    yield model
+    embedder._query_cache.clear()
+
+
+def test_same_query_embedded_once(fake_model):
+    first = embedder.embed_query("hello")
+    second = embedder.embed_query("hello")
+    assert fake_model.query_calls == 1
+    assert first is second
+
+
+def test_distinct_queries_not_shared(fake_model):
+    embedder.embed_query("a")
+    embedder.embed_query("bb")
+    assert fake_model.query_calls == 2
+
+
+def test_cached_vector_is_read_only(fake_model):
+    vec = embedder.embed_query("hello")
+    with pytest.raises(ValueError):
+        vec[0] = 1.0
+
+
+def test_reset_model_clears_memory_cache(fake_model):
+    embedder.embed_query("hello")
+    embedder.reset_model()
+    assert len(embedder._query_cache) == 0
+
+
+def test_disk_cache_survives_memory_clear(fake_model):
+    first = embedder.embed_query("persist me")
+    embedder._query_cache.clear()
+    again = embedder.embed_query("persist me")
+    assert fake_model.query_calls == 1
+    np.testing.assert_array_equal(first, again)
+
+
+def test_cache_key_includes_model(fake_model, monkeypatch):
+    embedder.embed_query("hello")
+    embedder._query_cache.clear()
+    monkeypatch.setattr(embedder, "EMBEDDING_MODEL", "other/model")
+    embedder.embed_query("hello")
+    assert fake_model.query_calls == 2
+
+
+def test_concurrent_misses_embed_once(fake_model):
+    def slow_embed(texts, _orig=fake_model.query_embed):
+        time.sleep(0.05)
+        return _orig(texts)
+
+    fake_model.query_embed = slow_embed
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(embedder.embed_query("shared")))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert fake_model.query_calls == 1
+    assert all(r is results[0] for r in results)
@@ -0,0 +1,109 @@
+"""Tests for the shared .mdc indexing helpers (no model download)."""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.engine import _indexing
+from src.engine.vector_store import NumpyVectorStore
+
+
+@pytest.fixture
+def parse_cache(monkeypatch):
+    cache = {}
+    monkeypatch.setattr(_indexing, "_parse_cache", cache)
+    return cache
+
+
+def _bump(path, text):
+    st = os.stat(path)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_parse_splits_frontmatter(tmp_path, parse_cache):
+    path = tmp_path / "a.mdc"
+    path.write_text("---\ndescription: hi\n---\nBody\n", encoding="utf-8")
+    parsed = _indexing.parse_mdc_file(str(path))
+    assert parsed.frontmatter == {"description": "hi"}
+    assert parsed.body == "Body"
+    assert len(parsed.digest) == 64
+
+
+def test_unchanged_file_served_from_cache(tmp_path, parse_cache, monkeypatch):
+    path = tmp_path / "a.mdc"
+    path.write_text("---\ndescription: hi\n---\nBody\n", encoding="utf-8")
+    first = _indexing.parse_mdc_file(str(path))
+    monkeypatch.setattr("builtins.open", lambda *a, **k: pytest.fail("re-read"))
+    assert _indexing.parse_mdc_file(str(path)) is first
+
+
+def test_edit_replaces_entry_in_place(tmp_path, parse_cache):
+    path = tmp_path / "a.mdc"
+    path.write_text("---\ndescription: one\n---\nBody\n", encoding="utf-8")
+    _indexing.parse_mdc_file(str(path))
+    _bump(path, "---\ndescription: two\n---\nBody\n")
+    assert _indexing.parse_mdc_file(str(path)).frontmatter == {"description": "two"}
+    assert list(parse_cache) == [str(path)]
+
+
+def test_bad_frontmatter_keeps_raw_body(tmp_path, parse_cache):
+    path = tmp_path / "a.mdc"
+    path.write_text("---\n: [unclosed\n---\nBody\n", encoding="utf-8")
+    parsed = _indexing.parse_mdc_file(str(path))
+    assert parsed.frontmatter == {}
+    assert parsed.body.startswith("---")
+
+
+@pytest.fixture
+def fake_embed(monkeypatch):
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return [np.full(4, float(len(t)), dtype=np.float32) for t in texts]
+
+    monkeypatch.setattr(_indexing, "embed_texts", embed)
+    return calls
+
+
+def _entry(name, digest, text):
+    return name, digest, text, {"filename": name}
+
+
+def test_manifest_round_trip(tmp_path):
+    path = str(tmp_path / "data" / "manifest.json")
+    assert _indexing.load_manifest(path) == {}
+    _indexing.save_manifest(path, {"a.mdc": "d1"})
+    assert _indexing.load_manifest(path) == {"a.mdc": "d1"}
+
+
+def test_manifest_from_other_model_ignored(tmp_path, monkeypatch):
+    path = str(tmp_path / "manifest.json")
+    _indexing.save_manifest(path, {"a.mdc": "d1"})
+    monkeypatch.setattr(_indexing, "EMBEDDING_MODEL", "other/model")
+    assert _indexing.load_manifest(path) == {}
+
+
+def test_reindex_embeds_only_changed(tmp_path, fake_embed):
+    store = NumpyVectorStore(name="t", data_dir=str(tmp_path))
+    manifest = str(tmp_path / "manifest.json")
+    entries = [_entry("a.mdc", "d1", "aaaa"), _entry("b.mdc", "d1", "bb"), None]
+    assert _indexing.replace_index(store, entries, manifest, "test") == 2
+    assert fake_embed == [["aaaa", "bb"]]
+
+    entries = [_entry("a.mdc", "d1", "aaaa"), _entry("b.mdc", "d2", "bbbbbb")]
+    assert _indexing.replace_index(store, entries, manifest, "test") == 2
+    assert fake_embed[1:] == [["bbbbbb"]]
+    assert _indexing.load_manifest(manifest) == {"a.mdc": "d1", "b.mdc": "d2"}
+    assert store.count() == 2
+
+
+def test_reindex_with_no_entries_clears_store(tmp_path, fake_embed):
+    store = NumpyVectorStore(name="t", data_dir=str(tmp_path))
+    manifest = str(tmp_path / "manifest.json")
+    _indexing.replace_index(store, [_entry("a.mdc", "d1", "a")], manifest, "test")
+    assert _indexing.replace_index(store, [None], manifest, "test") == 0
+    assert store.count() == 0
+    assert _indexing.load_manifest(manifest) == {}
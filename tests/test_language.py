@@ -10,6 +10,7 @@ Tests the LanguageDetector class and its ability to:
 
 import pytest
 from unittest.mock import Mock, patch
+from src.engine import language as language_module
 from src.engine.language import (
     LanguageDetector,
     detect_language,
@@ -19,6 +20,15 @@ from src.engine.language import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _isolated_language_cache(tmp_path, monkeypatch):
+    """Point the persistent detection cache at a per-test file so results
+    from one test (or a previous run) can't mask mocked langdetect calls."""
+    monkeypatch.setattr(
+        language_module, "LANGUAGE_CACHE_PATH", str(tmp_path / "language_cache.sqlite3")
+    )
+
+
 class TestLanguageDetector:
     """Test suite for LanguageDetector class."""
 
@@ -29,6 +39,14 @@ class TestLanguageDetector:
         # langdetect should be available if installed
         # If not installed, detector.langdetect will be None
 
+    def test_profiles_loaded_into_private_factory(self):
+        """All profiles are loaded up front without touching langdetect's global."""
+        from langdetect import detector_factory
+        before = detector_factory._factory
+        detector = LanguageDetector()
+        assert set(LANG_MAP) < set(detector._factory.get_lang_list())
+        assert detector_factory._factory is before
+
     def test_russian_detection(self):
         """Test detection of Russian text."""
         detector = LanguageDetector()
@@ -149,19 +167,24 @@ class TestLanguageDetector:
         detector = LanguageDetector()
         
         # Mock langdetect to return an unmapped code
-        with patch.object(detector, 'langdetect') as mock_langdetect:
-            mock_langdetect.detect.return_value = "xx"  # Unmapped code
-            mock_langdetect.LangDetectException = Exception
-            
+        with patch.object(detector, '_detect_iso', return_value="xx") as mock_detect:
             result = detector.detect("Some text")
             assert result == DEFAULT_LANGUAGE
+            mock_detect.assert_called_once()
+
+    def test_unmapped_language_falls_back_to_default(self):
+        """Text in a language outside LANG_MAP is not forced onto a mapped one."""
+        detector = LanguageDetector()
+        text = "Xin chào, hôm nay trời rất đẹp và chúng tôi đi dạo trong công viên."
+        assert detector._detect_iso(text) == "vi"
+        assert detector.detect(text) == DEFAULT_LANGUAGE
 
     def test_langdetect_exception_handling(self):
         """Test that LangDetectException is handled gracefully."""
         detector = LanguageDetector()
         
         if detector.langdetect:
-            with patch.object(detector.langdetect, 'detect') as mock_detect:
+            with patch.object(detector, '_detect_iso') as mock_detect:
                 # LangDetectException requires code and message
                 mock_detect.side_effect = detector.langdetect.LangDetectException(code=1, message="Test error")
                 
@@ -173,7 +196,7 @@ class TestLanguageDetector:
         detector = LanguageDetector()
         
         if detector.langdetect:
-            with patch.object(detector.langdetect, 'detect') as mock_detect:
+            with patch.object(detector, '_detect_iso') as mock_detect:
                 mock_detect.side_effect = RuntimeError("Unexpected error")
                 
                 result = detector.detect("Some text")
@@ -189,6 +212,82 @@ class TestLanguageDetector:
         assert result == DEFAULT_LANGUAGE
 
 
+class TestPersistentCache:
+    """Test suite for the on-disk detection cache."""
+
+    def test_result_persists_across_instances(self, tmp_path):
+        """A fresh detector reuses results stored by a previous one."""
+        cache_path = str(tmp_path / "shared.sqlite3")
+        text = "Bonjour, comment allez-vous? Ceci est un message de test."
+        assert LanguageDetector(cache_path=cache_path).detect(text) == "French"
+
+        detector = LanguageDetector(cache_path=cache_path)
+        with patch.object(detector, "_detect_iso") as mock_detect:
+            assert detector.detect(text) == "French"
+            mock_detect.assert_not_called()
+
+    def test_failed_detection_not_persisted(self, tmp_path):
+        """Exceptions fall back to default without pinning it in the cache."""
+        cache_path = str(tmp_path / "shared.sqlite3")
+        text = "Guten Tag, wie geht es Ihnen? Dies ist eine Testnachricht."
+        detector = LanguageDetector(cache_path=cache_path)
+        with patch.object(detector, "_detect_iso", side_effect=RuntimeError("boom")):
+            assert detector.detect(text) == DEFAULT_LANGUAGE
+
+        assert LanguageDetector(cache_path=cache_path).detect(text) == "German"
+
+    def test_disk_cache_pruned_to_max_rows(self, tmp_path, monkeypatch):
+        """Oldest rows are dropped so the cache file cannot grow forever."""
+        monkeypatch.setattr(language_module, "_DISK_CACHE_MAX_ROWS", 5)
+        monkeypatch.setattr(language_module, "_DISK_CACHE_PRUNE_EVERY", 4)
+        cache = language_module._DetectionCache(str(tmp_path / "cache.sqlite3"))
+        for i in range(12):
+            cache.set(f"k{i}", "English")
+        rows = cache._conn.execute("SELECT COUNT(*) FROM detections").fetchone()[0]
+        assert rows <= 5 + 4
+        assert cache.get("k0") is None
+        assert cache.get("k11") == "English"
+
+    def test_unwritable_cache_path_degrades(self, tmp_path):
+        """A broken cache location must not break detection."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        detector = LanguageDetector(cache_path=str(blocker / "cache.sqlite3"))
+        assert detector.detect("Hello, how are you? This is English.") == "English"
+
+
+class TestScriptFastPath:
+    """Test suite for the script-based short-circuit before langdetect."""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("안녕하세요, 오늘 날씨가 정말 좋네요.", "Korean"),
+        ("こんにちは、今日はとても良い天気ですね。", "Japanese"),
+        ("Γειά σου, πώς είσαι σήμερα;", "Greek"),
+        ("שלום, מה שלומך היום?", "Hebrew"),
+        ("Это сообщение на русском языке.", "Russian"),
+        ("Привіт, як справи? Це її повідомлення.", "Ukrainian"),
+    ])
+    def test_unambiguous_script_skips_langdetect(self, text, expected):
+        """Scripts that identify the language never reach the n-gram model."""
+        detector = LanguageDetector()
+        with patch.object(detector, "_detect_iso") as mock_detect:
+            assert detector.detect(text) == expected
+            mock_detect.assert_not_called()
+
+    @pytest.mark.parametrize("text", [
+        "Hello, how are you doing today?",
+        "你好，今天天气很好。",
+        "Это текст на русском языке with some English words.",
+        "привет как дела",
+    ])
+    def test_ambiguous_text_falls_through(self, text):
+        """Latin, Han-only, mixed, or marker-free Cyrillic text uses langdetect."""
+        detector = LanguageDetector()
+        with patch.object(detector, "_detect_iso", return_value="en") as mock_detect:
+            detector.detect(text)
+            mock_detect.assert_called_once()
+
+
 class TestLanguageMapping:
     """Test suite for language code mapping."""
 
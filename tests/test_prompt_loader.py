@@ -0,0 +1,215 @@
+"""Tests for the mtime-validated agent prompt/metadata caches."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from src.utils import prompt_loader
+
+
+@pytest.fixture
+def agents_dir(tmp_path, monkeypatch):
+    agent = tmp_path / "demo"
+    agent.mkdir()
+    (agent / "system_prompt.mdc").write_text(
+        "---\nidentity:\n  role: first\n---\nBody one\n", encoding="utf-8"
+    )
+    monkeypatch.setattr(prompt_loader, "AGENTS_DIR", str(tmp_path))
+    monkeypatch.setattr(prompt_loader, "_AGENTS_DIR_REAL", os.path.realpath(tmp_path))
+    monkeypatch.setattr(prompt_loader, "_prompt_cache", {})
+    monkeypatch.setattr(prompt_loader, "_metadata_cache", {})
+    monkeypatch.setattr(prompt_loader, "_file_cache", {})
+    monkeypatch.setattr(prompt_loader, "_expanded_cache", {})
+    return agent
+
+
+def _rewrite(path, text):
+    st = os.stat(path)
+    path.write_text(text, encoding="utf-8")
+    # Force a distinct mtime even on coarse-grained filesystems
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_repeat_load_served_from_cache(agents_dir, monkeypatch):
+    assert prompt_loader.load_agent_prompt("demo") == "Body one"
+    monkeypatch.setattr(prompt_loader, "load_file_content", lambda p: pytest.fail("re-read"))
+    assert prompt_loader.load_agent_prompt("demo") == "Body one"
+
+
+def test_invalidate_cache_forces_reload(agents_dir, monkeypatch):
+    assert prompt_loader.load_agent_prompt("demo") == "Body one"
+    prompt_loader.invalidate_cache()
+    reads = []
+    real_load = prompt_loader.load_file_content
+    monkeypatch.setattr(
+        prompt_loader, "load_file_content", lambda p: reads.append(p) or real_load(p)
+    )
+    assert prompt_loader.load_agent_prompt("demo") == "Body one"
+    assert len(reads) == 1
+
+
+def test_edit_invalidates_prompt_and_metadata(agents_dir):
+    assert prompt_loader.get_agent_metadata("demo")["identity"]["role"] == "first"
+    assert prompt_loader.load_agent_prompt("demo") == "Body one"
+
+    _rewrite(agents_dir / "system_prompt.mdc", "---\nidentity:\n  role: second\n---\nBody two\n")
+
+    assert prompt_loader.get_agent_metadata("demo")["identity"]["role"] == "second"
+    assert prompt_loader.load_agent_prompt("demo") == "Body two"
+
+
+def test_cached_metadata_is_a_copy(agents_dir):
+    prompt_loader.get_agent_metadata("demo")["extra"] = 1
+    assert "extra" not in prompt_loader.get_agent_metadata("demo")
+
+
+def test_file_content_cached_until_changed(tmp_path, monkeypatch):
+    monkeypatch.setattr(prompt_loader, "_file_cache", {})
+    path = tmp_path / "shared.mdc"
+    path.write_text("---\nalwaysApply: false\n---\nShared v1\n", encoding="utf-8")
+    assert prompt_loader.load_file_content(str(path)) == "Shared v1"
+
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *a, **k: pytest.fail("re-read"))
+    assert prompt_loader.load_file_content(str(path)) == "Shared v1"
+    monkeypatch.setattr("builtins.open", real_open)
+
+    _rewrite(path, "---\nalwaysApply: false\n---\nShared v2\n")
+    assert prompt_loader.load_file_content(str(path)) == "Shared v2"
+
+
+def test_missing_file_marker(tmp_path):
+    missing = str(tmp_path / "nope.mdc")
+    assert prompt_loader.load_file_content(missing) == f"[MISSING FILE: {missing}]"
+
+
+@pytest.fixture
+def import_tree(tmp_path, monkeypatch):
+    """Files under tmp_path, referenced as ``@name.mdc``."""
+    monkeypatch.setattr(prompt_loader, "_file_cache", {})
+    monkeypatch.setattr(prompt_loader, "_expanded_cache", {})
+    monkeypatch.setattr(prompt_loader, "resolve_path", lambda ref: str(tmp_path / ref[1:]))
+
+    def write(name, body):
+        (tmp_path / name).write_text(body, encoding="utf-8")
+
+    return write
+
+
+def test_import_cycle_reported(import_tree):
+    import_tree("a.mdc", "A @b.mdc")
+    import_tree("b.mdc", "B @a.mdc")
+    assert prompt_loader.process_imports("@a.mdc") == "A B [CIRCULAR REFERENCE: @a.mdc]"
+
+
+def test_shared_import_expanded_once(import_tree, monkeypatch):
+    import_tree("a.mdc", "A(@common.mdc)")
+    import_tree("b.mdc", "B(@common.mdc)")
+    import_tree("common.mdc", "C(@leaf.mdc)")
+    import_tree("leaf.mdc", "L")
+    reads = []
+    real_load = prompt_loader.load_file_content
+    monkeypatch.setattr(
+        prompt_loader, "load_file_content", lambda p: reads.append(p) or real_load(p)
+    )
+
+    loaded = []
+    out = prompt_loader.process_imports("@a.mdc @b.mdc", loaded=loaded)
+
+    assert out == "A(C(L)) B(C(L))"
+    assert len(reads) == 4
+    assert len(loaded) == 4
+
+
+
+def test_expansion_reused_across_calls(import_tree, tmp_path, monkeypatch):
+    import_tree("common.mdc", "C(@leaf.mdc)")
+    import_tree("leaf.mdc", "L")
+    loaded = []
+    assert prompt_loader.process_imports("A(@common.mdc)", loaded=loaded) == "A(C(L))"
+
+    monkeypatch.setattr(prompt_loader, "load_file_content", lambda p: pytest.fail("re-read"))
+    again = []
+    assert prompt_loader.process_imports("B(@common.mdc)", loaded=again) == "B(C(L))"
+    assert again == loaded
+
+
+def test_expansion_reexpanded_after_edit(import_tree, tmp_path):
+    import_tree("common.mdc", "C(@leaf.mdc)")
+    import_tree("leaf.mdc", "L")
+    assert prompt_loader.process_imports("@common.mdc") == "C(L)"
+    _rewrite(tmp_path / "leaf.mdc", "L2")
+    assert prompt_loader.process_imports("@common.mdc") == "C(L2)"
+
+
+def test_cyclic_expansion_not_memoized(import_tree):
+    import_tree("a.mdc", "A @b.mdc")
+    import_tree("b.mdc", "B @a.mdc")
+    prompt_loader.process_imports("@a.mdc")
+    assert prompt_loader._expanded_cache == {}
+    assert prompt_loader.process_imports("@b.mdc") == "B A [CIRCULAR REFERENCE: @b.mdc]"
+
+def test_prewarm_fills_file_cache(agents_dir, monkeypatch):
+    assert prompt_loader.prewarm_prompt_cache() == 1
+    path = os.path.realpath(agents_dir / "system_prompt.mdc")
+    assert path in prompt_loader._file_cache
+    monkeypatch.setattr("builtins.open", lambda *a, **k: pytest.fail("re-read"))
+    assert prompt_loader.load_file_content(path) == "Body one"
+
+
+@pytest.mark.parametrize("ref", ["@agents/../../outside.mdc", "../outside.mdc"])
+def test_resolve_path_rejects_escape(ref):
+    with pytest.raises(ValueError):
+        prompt_loader.resolve_path(ref)
+
+
+def test_sibling_prefix_dir_is_outside(tmp_path):
+    root = str(tmp_path / "agents")
+    assert prompt_loader._is_within(root + "/demo/x.mdc", root)
+    assert not prompt_loader._is_within(root + "-evil/x.mdc", root)
+
+
+@pytest.mark.parametrize("name", ["..", "../demo", "demo/../demo", ""])
+def test_invalid_agent_name_rejected(agents_dir, name):
+    with pytest.raises(ValueError):
+        prompt_loader.load_agent_prompt(name)
+    assert prompt_loader.get_agent_metadata(name) == {}
+
+
+def test_concurrent_misses_build_once(agents_dir, monkeypatch):
+    calls = []
+    real_build = prompt_loader._build_agent_prompt
+
+    def slow_build(name, path):
+        calls.append(name)
+        time.sleep(0.05)
+        return real_build(name, path)
+
+    monkeypatch.setattr(prompt_loader, "_build_agent_prompt", slow_build)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(prompt_loader.load_agent_prompt("demo")))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == ["demo"]
+    assert results == ["Body one"] * 4
+
+
+def test_cached_predicates_track_loads_and_edits(agents_dir):
+    assert not prompt_loader.is_prompt_cached("demo")
+    assert not prompt_loader.is_metadata_cached("demo")
+    prompt_loader.load_agent_prompt("demo")
+    prompt_loader.get_agent_metadata("demo")
+    assert prompt_loader.is_prompt_cached("demo")
+    assert prompt_loader.is_metadata_cached("demo")
+
+    _rewrite(agents_dir / "system_prompt.mdc", "---\nidentity:\n  role: second\n---\nBody two\n")
+    assert not prompt_loader.is_prompt_cached("demo")
+    assert not prompt_loader.is_metadata_cached("demo")
+    assert not prompt_loader.is_prompt_cached("../demo")
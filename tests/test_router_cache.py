@@ -0,0 +1,142 @@
+"""Tests for SemanticRouter's in-process caches (no model download)."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from src.engine import router as router_mod
+from src.engine.router import SemanticRouter
+
+
+@pytest.fixture
+def agents_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(router_mod, "AGENTS_DIR", str(tmp_path))
+    monkeypatch.setattr(router_mod, "_scan_cache", {})
+    return tmp_path
+
+
+def _bare_router() -> SemanticRouter:
+    # Skip __init__: it opens the on-disk vector store.
+    return SemanticRouter.__new__(SemanticRouter)
+
+
+def _touch_later(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _add_agent(root, name, with_prompt=True):
+    agent = root / name
+    agent.mkdir()
+    if with_prompt:
+        (agent / "system_prompt.mdc").write_text("---\n---\n", encoding="utf-8")
+    return agent
+
+
+def test_scan_served_from_cache(agents_dir, monkeypatch):
+    _add_agent(agents_dir, "coder")
+    assert _bare_router()._scan_agents() == ["coder"]
+    monkeypatch.setattr(os, "scandir", lambda *a: pytest.fail("rescanned"))
+    assert _bare_router()._scan_agents() == ["coder"]
+
+
+def test_prompt_added_to_existing_dir_is_picked_up(agents_dir):
+    _add_agent(agents_dir, "coder")
+    draft = _add_agent(agents_dir, "draft", with_prompt=False)
+    assert _bare_router()._scan_agents() == ["coder"]
+
+    (draft / "system_prompt.mdc").write_text("---\n---\n", encoding="utf-8")
+    _touch_later(draft)
+    assert _bare_router()._scan_agents() == ["coder", "draft"]
+
+
+def test_prompt_removed_from_existing_dir_is_picked_up(agents_dir):
+    _add_agent(agents_dir, "coder")
+    writer = _add_agent(agents_dir, "writer")
+    assert _bare_router()._scan_agents() == ["coder", "writer"]
+
+    (writer / "system_prompt.mdc").unlink()
+    _touch_later(writer)
+    assert _bare_router()._scan_agents() == ["coder"]
+
+
+class _FakeStore:
+    """Records how many entries each save() persisted; the first save can be
+    held open to simulate a slow disk write."""
+
+    def __init__(self):
+        self.ids = []
+        self.saves = []
+        self.first_save_started = threading.Event()
+        self.release_first_save = threading.Event()
+        self.release_first_save.set()
+
+    def add(self, ids, **kwargs):
+        self.ids.extend(ids)
+
+    def save(self):
+        if not self.saves:
+            self.first_save_started.set()
+            self.release_first_save.wait(5)
+        self.saves.append(len(self.ids))
+
+    def dim(self):
+        return 4
+
+
+@pytest.fixture
+def flush_router():
+    router = _bare_router()
+    router._marker_lock = threading.RLock()
+    router._flush_lock = threading.Lock()
+    router._dirty_gen = 0
+    router._saved_gen = 0
+    router.store = _FakeStore()
+    router._write_marker = lambda model, dim: None
+    return router
+
+
+def _add(router, request_id) -> int:
+    """The in-memory half of update_cache: add and bump the dirty gen."""
+    with router._marker_lock:
+        router.store.add(ids=[request_id])
+        router._dirty_gen += 1
+        return router._dirty_gen
+
+
+def _run_threads(*targets):
+    threads = [threading.Thread(target=t) for t in targets]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+
+def test_concurrent_writes_share_one_flush(flush_router):
+    gens = [_add(flush_router, f"q{i}") for i in range(4)]
+    _run_threads(*(lambda g=g: flush_router._flush_cache(g) for g in gens))
+
+    assert flush_router.store.saves == [4]
+    assert flush_router._saved_gen == 4
+
+
+def test_write_during_flush_is_not_lost(flush_router):
+    store = flush_router.store
+    store.release_first_save.clear()
+    first = _add(flush_router, "q0")
+
+    def _late_writer():
+        store.first_save_started.wait(5)
+        flush_router._flush_cache(_add(flush_router, "q1"))
+
+    def _release():
+        store.first_save_started.wait(5)
+        time.sleep(0.05)  # let the late writer queue behind the slow save
+        store.release_first_save.set()
+
+    _run_threads(lambda: flush_router._flush_cache(first), _late_writer, _release)
+
+    assert store.saves == [1, 2]
+    assert flush_router._saved_gen == 2
@@ -0,0 +1,70 @@
+"""Tests for scripts/validate_agents.py error reporting."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "validate_agents.py"
+_spec = importlib.util.spec_from_file_location("validate_agents", _SCRIPT)
+validate_agents = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(validate_agents)
+
+BROKEN = {"identity": {"name": "x"}, "routing": {}}
+
+
+@pytest.fixture(scope="module")
+def schema():
+    return validate_agents.load_schema()
+
+
+def test_fallback_lists_every_problem(schema):
+    ok, messages = validate_agents.validate_agent("x", BROKEN, schema, None)
+    assert not ok
+    assert "Missing identity.role" in messages
+    assert "Missing routing.trigger_command" in messages
+
+
+@pytest.fixture(scope="module")
+def compiled(schema):
+    validate_fn = validate_agents.compile_validator(schema)
+    if validate_fn is None:
+        pytest.skip("fastjsonschema not installed")
+    return validate_fn
+
+
+def test_compiled_validator_lists_every_problem(schema, compiled):
+    ok, messages = validate_agents.validate_agent("x", BROKEN, schema, compiled)
+    assert not ok
+    assert "Missing identity.role" in messages
+    assert "Missing routing.trigger_command" in messages
+
+
+@pytest.mark.parametrize("use_compiled", [False, True])
+def test_each_missing_field_reported_once(schema, request, use_compiled):
+    validate_fn = request.getfixturevalue("compiled") if use_compiled else None
+    ok, messages = validate_agents.validate_agent("x", {}, schema, validate_fn)
+    assert not ok
+    errors = [m for m in messages if not m.startswith(("DEPRECATED", "REMOVED"))]
+    assert sorted(errors) == sorted(
+        f"Missing required field: '{field}'" for field in schema["required"]
+    )
+
+
+def test_compiled_validator_names_field_structural_checks_miss(schema, compiled):
+    valid_identity = {"name": "x", "display_name": "X", "role": "r", "tone": "t"}
+    frontmatter = {
+        "identity": {**valid_identity, "name": 42},
+        "routing": {"domain_keywords": [], "trigger_command": "/x"},
+        "core_skills": [], "preferred_skills": [], "capable_skills": [],
+    }
+    ok, messages = validate_agents.validate_agent("x", frontmatter, schema, compiled)
+    assert not ok
+    assert messages[0].startswith("Schema violation at 'data.identity.name'")
+
+
+def test_type_error_not_repeated_by_compiled_validator(schema, compiled):
+    frontmatter = {**BROKEN, "core_skills": "skill-x"}
+    _, messages = validate_agents.validate_agent("x", frontmatter, schema, compiled)
+    assert messages.count("core_skills must be an array") == 1
+    assert not any(m.startswith("Schema violation") for m in messages)
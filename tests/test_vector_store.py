@@ -84,6 +84,34 @@ class TestQuery:
         result = populated_store.query(np.array([[1.0, 0.0, 0.0]]), n_results=1)
         assert result.ids == ["a"]
 
+    def test_large_store_partial_sort_matches_full_sort(self, store):
+        """Partial top-n selection on a large store agrees with a full sort."""
+        rng = np.random.default_rng(0)
+        embs = rng.normal(size=(2000, 8)).astype(np.float32)
+        ids = [f"id{i}" for i in range(len(embs))]
+        store.replace(ids=ids, embeddings=embs, documents=ids, metadatas=[{} for _ in ids])
+        q = rng.normal(size=8).astype(np.float32)
+
+        result = store.query(q, n_results=10)
+
+        normed = embs / np.linalg.norm(embs, axis=1, keepdims=True)
+        expected = np.argsort(1.0 - normed @ (q / np.linalg.norm(q)))[:10]
+        assert result.ids == [ids[i] for i in expected]
+        assert result.distances == sorted(result.distances)
+
+    def test_query_restricted_to_ids(self, populated_store):
+        """ids filter scores only the given entries and ignores unknown IDs."""
+        result = populated_store.query(
+            np.array([1.0, 0.0, 0.0]), n_results=3, ids={"b", "c", "missing"}
+        )
+        assert set(result.ids) == {"b", "c"}
+        assert result.distances == sorted(result.distances)
+        assert result.documents == [f"doc_{i}" for i in result.ids]
+
+    def test_query_empty_id_filter(self, populated_store):
+        result = populated_store.query(np.array([1.0, 0.0, 0.0]), n_results=3, ids=[])
+        assert result.ids == []
+
     def test_query_invalid_shape_raises(self, populated_store):
         """Query with (2, D) embedding cannot be squeezed to 1-D."""
         with pytest.raises(ValueError, match="must be 1-D"):
@@ -104,6 +132,15 @@ class TestGetById:
         result = populated_store.get(ids=["a", "nonexistent", "c"])
         assert result.ids == ["a", "c"]
 
+    def test_get_embeddings_returns_found_only(self, populated_store):
+        embs = populated_store.get_embeddings(["c", "missing", "a"])
+        assert set(embs) == {"a", "c"}
+        np.testing.assert_array_equal(embs["a"], [1.0, 0.0, 0.0])
+        np.testing.assert_array_equal(embs["c"], [0.0, 0.0, 1.0])
+
+    def test_get_embeddings_empty_store(self, store):
+        assert store.get_embeddings(["a"]) == {}
+
 
 class TestPersistence:
     def test_save_and_load_roundtrip(self, populated_store, tmp_path):
@@ -114,6 +151,41 @@ class TestPersistence:
         result = loaded.query(np.array([1.0, 0.0, 0.0]), n_results=1)
         assert result.ids == ["a"]
 
+    def test_float16_storage_roundtrip(self, tmp_path):
+        """float16 on disk, float32 in memory, same nearest neighbours."""
+        rng = np.random.default_rng(0)
+        embs = rng.normal(size=(50, 16)).astype(np.float32)
+        ids = [f"id{i}" for i in range(len(embs))]
+        store = NumpyVectorStore(name="half", data_dir=str(tmp_path), storage_dtype=np.float16)
+        store.replace(ids=ids, embeddings=embs, documents=ids, metadatas=[{} for _ in ids])
+        store.save()
+
+        with np.load(tmp_path / "half.npz") as data:
+            assert data["embeddings"].dtype == np.float16
+
+        loaded = NumpyVectorStore(name="half", data_dir=str(tmp_path))
+        q = embs[7]
+        assert loaded.get_embeddings(["id7"])["id7"].dtype == np.float32
+        assert loaded.query(q, n_results=3).ids == store.query(q, n_results=3).ids
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_metadata_roundtrip_json_backends(self, tmp_path, monkeypatch, use_orjson):
+        """Metadata survives save/load with and without orjson, non-ASCII intact."""
+        import src.engine.vector_store as vs
+        if not use_orjson:
+            monkeypatch.setattr(vs, "orjson", None)
+        elif vs.orjson is None:
+            pytest.skip("orjson not installed")
+        store = NumpyVectorStore(name="meta", data_dir=str(tmp_path))
+        store.replace(ids=["ru"], embeddings=np.array([[1.0, 0.0]]),
+                      documents=["привет"], metadatas=[{"agent": "переводчик", "n": 1}])
+        store.save()
+
+        loaded = NumpyVectorStore(name="meta", data_dir=str(tmp_path))
+        result = loaded.get(["ru"])
+        assert result.documents == ["привет"]
+        assert result.metadatas == [{"agent": "переводчик", "n": 1}]
+
     def test_load_empty_dir(self, tmp_path):
         """Loading from empty dir should create empty store."""
         store = NumpyVectorStore(name="empty", data_dir=str(tmp_path))
@@ -162,6 +234,19 @@ class TestAdd:
         assert populated_store.count() == 3
 
 
+    def test_incremental_norms_match_full_recompute(self, store):
+        """Normalized rows maintained by add/trim equal a from-scratch recompute."""
+        rng = np.random.default_rng(1)
+        embs = rng.normal(size=(12, 5)).astype(np.float32)
+        for i, emb in enumerate(embs):
+            store.add(ids=[f"id{i}"], embeddings=emb.reshape(1, -1),
+                      documents=[f"d{i}"], metadatas=[{}])
+        store.trim(8)
+        incremental = store._normed.copy()
+        store._recompute_norms()
+        np.testing.assert_allclose(incremental, store._normed, rtol=1e-6)
+
+
 class TestTrim:
     def test_trim_keeps_most_recent(self, populated_store):
         populated_store.trim(2)